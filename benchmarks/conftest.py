@@ -0,0 +1,27 @@
+"""Fixtures of floureon benchmarks"""
+import pytest
+
+from benchmarks.harness import HOSTS, LATENCY, LOSS
+from custom_components.floureon import BroadlinkThermostat
+from tests.simulator import SimulatedFleet
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    yield
+
+
+@pytest.fixture
+def expected_lingering_timers() -> bool:
+    """Coordinators leave warm-up, refresh and clock sync timers behind"""
+    return True
+
+
+@pytest.fixture
+def fleet():
+    """Simulated thermostats configured by harness environment variables"""
+    with SimulatedFleet(HOSTS, latency=LATENCY, loss=LOSS, seed=1) as fleet:
+        yield fleet
+
+    # Broadlink sessions are shared by host across benchmarks
+    BroadlinkThermostat._sessions.clear()
@@ -0,0 +1,137 @@
+"""Benchmark harness, drives integration code against simulated thermostat fleet and reports measurements.
+
+Fleet is set with environment variables:
+FLOUREON_BENCH_HOSTS - number of thermostats (10)
+FLOUREON_BENCH_LATENCY - response delay in seconds (0.01)
+FLOUREON_BENCH_LOSS - packet loss probability (0)
+FLOUREON_BENCH_ROUNDS - poll rounds of every benchmark (5)
+
+Run with: pytest benchmarks -s
+"""
+import asyncio
+import os
+import threading
+import time
+
+from homeassistant.const import Platform
+from homeassistant.setup import async_setup_component
+
+from custom_components.floureon import DATA_COORDINATORS, DOMAIN, percentile_ms
+
+HOSTS = int(os.environ.get('FLOUREON_BENCH_HOSTS', 10))
+LATENCY = float(os.environ.get('FLOUREON_BENCH_LATENCY', 0.01))
+LOSS = float(os.environ.get('FLOUREON_BENCH_LOSS', 0))
+ROUNDS = int(os.environ.get('FLOUREON_BENCH_ROUNDS', 5))
+
+
+def report(title, fleet=None, **values) -> None:
+    """Print measurements as aligned table, titled with simulated fleet they were taken on"""
+    if fleet is not None:
+        title = '{0} ({1} hosts, {2:g} ms latency, {3:.0%} loss)'.format(
+            title, len(fleet), fleet.latency * 1000, fleet.loss
+        )
+    print('\n' + title)
+    width = max(map(len, values))
+    for name, value in values.items():
+        print('  {0:<{1}}  {2}'.format(name, width, value))
+
+
+class ExecutorUsage:
+    """Count jobs, their concurrency and threads they ran on"""
+
+    def __init__(self):
+        self.jobs = 0
+        self.active = 0
+        self.max_active = 0
+        self.threads = set()
+        self._lock = threading.Lock()
+
+    def wrap(self, func):
+        """Return func recording every run"""
+        def run(*args):
+            with self._lock:
+                self.jobs += 1
+                self.active += 1
+                self.max_active = max(self.max_active, self.active)
+                self.threads.add(threading.get_ident())
+            try:
+                return func(*args)
+            finally:
+                with self._lock:
+                    self.active -= 1
+
+        return run
+
+    @property
+    def stats(self) -> dict:
+        return {
+            'executor_jobs': self.jobs,
+            'executor_threads': len(self.threads),
+            'executor_max_concurrent': self.max_active
+        }
+
+
+def latency_stats(polls, elapsed, latency) -> dict:
+    """Return poll throughput and latency percentiles"""
+    return {
+        'polls': polls,
+        'polls_per_second': round(polls / elapsed, 1),
+        'latency_p50_ms': percentile_ms(latency, 0.5),
+        'latency_p99_ms': percentile_ms(latency, 0.99)
+    }
+
+
+async def async_setup_fleet(hass, fleet, platforms=(Platform.CLIMATE, Platform.SWITCH)) -> list:
+    """Set up entities of every simulated thermostat from YAML, return coordinators in fleet order"""
+    for platform in platforms:
+        assert await async_setup_component(hass, platform, {platform: [
+            {'platform': DOMAIN, 'name': 'bench {0} {1}'.format(platform, i), 'host': thermostat.host,
+             'port': thermostat.port}
+            for i, thermostat in enumerate(fleet)
+        ]})
+    await hass.async_block_till_done()
+
+    coordinators = hass.data[DOMAIN][DATA_COORDINATORS]
+    return [coordinators[thermostat.host] for thermostat in fleet]
+
+
+async def async_poll(coordinators, rounds=ROUNDS) -> float:
+    """Refresh every coordinator for number of rounds, return elapsed seconds"""
+    for coordinator in coordinators:
+        coordinator.poll_latency.clear()
+
+    start = time.monotonic()
+    for _ in range(rounds):
+        await asyncio.gather(*(coordinator.async_refresh() for coordinator in coordinators))
+
+    return time.monotonic() - start
+
+
+class LoopLag:
+    """Measure how late event loop wakes up a ticker, anything blocking the loop shows up as lag"""
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.samples = []
+        self._task = None
+
+    async def _tick(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(loop.time() - start - self.interval)
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._tick())
+
+    async def stop(self) -> None:
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    @property
+    def max_ms(self):
+        return round(max(self.samples) * 1000, 1) if self.samples else None
@@ -0,0 +1,45 @@
+"""Event loop lag while service calls wait on unreachable thermostats"""
+import asyncio
+import time
+
+from homeassistant.const import Platform
+
+from benchmarks.harness import LoopLag, async_setup_fleet, report
+from custom_components.floureon import BREAKER_THRESHOLD, percentile_ms
+from tests.simulator import SimulatedFleet
+
+# Calls until circuit breaker opens and one more, which is rejected right away
+CALLS = BREAKER_THRESHOLD + 1
+
+
+async def test_service_calls_on_unreachable_thermostats(hass) -> None:
+    """Native client and broadlink fallback thermostats drop every packet, calls must never block event loop"""
+    with SimulatedFleet(2, loss=1.0) as fleet:
+        coordinators = await async_setup_fleet(hass, fleet, [Platform.CLIMATE])
+        coordinators[1].async_close_client()
+
+        async def async_set_temperature(i):
+            durations = []
+            for call in range(CALLS):
+                start = time.monotonic()
+                await hass.services.async_call('climate', 'set_temperature', {
+                    'entity_id': 'climate.bench_climate_{0}'.format(i), 'temperature': 20 + call / 2
+                }, blocking=True)
+                durations.append(round(time.monotonic() - start, 2))
+            return durations
+
+        lag = LoopLag()
+        lag.start()
+        durations = await asyncio.gather(*map(async_set_temperature, range(len(fleet))))
+        await lag.stop()
+
+    for transport, coordinator, call_durations in zip(('asyncio', 'broadlink'), coordinators, durations):
+        report(
+            'Service calls on unreachable thermostat, {0} transport'.format(transport), fleet,
+            call_seconds=call_durations,
+            breaker=coordinator.breaker.state,
+            commands_sent=coordinator.commands_sent
+        )
+    report('Event loop during calls', fleet, loop_lag_p99_ms=percentile_ms(lag.samples, 0.99), loop_lag_max_ms=lag.max_ms)
+
+    assert lag.max_ms < 100
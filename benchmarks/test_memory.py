@@ -0,0 +1,56 @@
+"""Memory footprint of thermostat status and entities of a large fleet"""
+import tracemalloc
+
+from custom_components.floureon import DOMAIN, FloureonCoordinator, ThermostatStatus, protocol
+from custom_components.floureon import climate, switch
+
+from benchmarks.harness import report
+from tests.simulator import SimulatedFleet
+
+COUNT = 1000
+
+
+def allocated(factory) -> int:
+    """Return bytes retained per object built by factory"""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        objects = [factory() for _ in range(COUNT)]
+        size = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+    del objects
+    return size // COUNT
+
+
+async def test_status_and_entity_footprint(hass) -> None:
+    with SimulatedFleet(1) as fleet:
+        payload = bytes([0x01, 0x03, 44]) + fleet[0].registers()
+
+    coordinator = FloureonCoordinator(hass, '127.0.0.1')
+    coordinator.data = ThermostatStatus(**protocol.decode_status(payload))
+    config = {'platform': DOMAIN, 'name': 'bench', 'host': '127.0.0.1'}
+
+    def climate_entity():
+        entity = climate.FloureonClimate(hass, climate.PLATFORM_SCHEMA(config), coordinator)
+        entity.update_from_data(coordinator.status)
+        return entity
+
+    def switch_entity():
+        entity = switch.FloureonSwitch(hass, switch.PLATFORM_SCHEMA(config), coordinator)
+        entity.update_from_data(coordinator.status)
+        return entity
+
+    status_dict = allocated(lambda: protocol.decode_status(payload))
+    status_record = allocated(lambda: ThermostatStatus(**protocol.decode_status(payload)))
+    report(
+        'Status and entity memory per thermostat',
+        status_dict_bytes=status_dict,
+        status_record_bytes=status_record,
+        climate_entity_bytes=allocated(climate_entity),
+        switch_entity_bytes=allocated(switch_entity)
+    )
+    coordinator.async_close()
+
+    assert status_record < status_dict
@@ -0,0 +1,69 @@
+"""Poll throughput, latency and executor usage of every thermostat transport"""
+import asyncio
+import time
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import callback
+
+from benchmarks.harness import ROUNDS, ExecutorUsage, async_poll, async_setup_fleet, latency_stats, report
+from custom_components.floureon import BroadlinkThermostat
+
+
+async def test_broadlink_thermostat(hass, fleet) -> None:
+    """Full status of every host read with broadlink library in executor"""
+    usage = ExecutorUsage()
+    thermostats = [BroadlinkThermostat(thermostat.host, port=thermostat.port) for thermostat in fleet]
+    latency = []
+
+    async def async_read(thermostat):
+        start = time.monotonic()
+        await hass.async_add_executor_job(usage.wrap(thermostat.run), ('get_full_status',))
+        latency.append(time.monotonic() - start)
+
+    start = time.monotonic()
+    for _ in range(ROUNDS):
+        await asyncio.gather(*map(async_read, thermostats))
+    elapsed = time.monotonic() - start
+
+    report('BroadlinkThermostat in executor', fleet, **latency_stats(len(latency), elapsed, latency), **usage.stats)
+    assert len(latency) == len(fleet) * ROUNDS
+
+
+async def test_entities(hass, fleet) -> None:
+    """Climate and switch entity of every host, polled with native client and then with broadlink fallback"""
+    coordinators = await async_setup_fleet(hass, fleet)
+    writes = []
+
+    @callback
+    def async_state_changed(event) -> None:
+        writes.append(event)
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, async_state_changed)
+
+    for transport in ('asyncio', 'broadlink'):
+        usage = ExecutorUsage()
+        if transport == 'broadlink':
+            for coordinator in coordinators:
+                coordinator.async_close_client()
+                coordinator.thermostat.run = usage.wrap(coordinator.thermostat.run)
+
+        polls = sum(coordinator.polls for coordinator in coordinators)
+        suppressed = sum(coordinator.suppressed_writes for coordinator in coordinators)
+        writes.clear()
+
+        elapsed = await async_poll(coordinators)
+        await hass.async_block_till_done()
+
+        report(
+            'FloureonClimate and FloureonSwitch, {0} transport'.format(transport), fleet,
+            **latency_stats(
+                sum(coordinator.polls for coordinator in coordinators) - polls, elapsed,
+                [latency for coordinator in coordinators for latency in coordinator.poll_latency]
+            ),
+            **usage.stats,
+            state_writes=len(writes),
+            suppressed_writes=sum(coordinator.suppressed_writes for coordinator in coordinators) - suppressed,
+            failed_hosts=sum(not coordinator.last_update_success for coordinator in coordinators),
+            fleet_wait_p99_ms=coordinators[0].poller.stats['wait_p99_ms']
+        )
+        assert all(hass.states.get('climate.bench_climate_{0}'.format(i)) is not None for i in range(len(fleet)))
@@ -0,0 +1,89 @@
+"""Socket calls per poll cycle of every thermostat transport"""
+import asyncio
+import socket
+from collections import Counter
+
+import pytest
+
+from benchmarks.harness import report
+from custom_components.floureon import BroadlinkThermostat, protocol
+
+# Socket methods counted, each ends up as a single system call
+SYSCALLS = ['bind', 'connect', 'send', 'sendto', 'recv', 'recvfrom', 'close']
+
+
+class CountingSocket(socket.socket):
+    """Socket counting its creation and system call methods"""
+
+    counts = Counter()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.counts['socket'] += 1
+
+
+def counting(name):
+    call = getattr(socket.socket, name)
+
+    def method(self, *args, **kwargs):
+        self.counts[name] += 1
+        return call(self, *args, **kwargs)
+
+    return method
+
+
+for syscall in SYSCALLS:
+    setattr(CountingSocket, syscall, counting(syscall))
+
+
+@pytest.fixture
+def counted_sockets(monkeypatch):
+    """Sockets created from now on are counted, simulator sockets already exist"""
+    monkeypatch.setattr(socket, 'socket', CountingSocket)
+    yield CountingSocket.counts
+
+
+async def test_socket_calls_per_poll_cycle(hass, fleet, counted_sockets) -> None:
+    """First cycle discovers and authenticates every host, steady cycles reuse sessions"""
+    thermostats = [BroadlinkThermostat(thermostat.host, port=thermostat.port) for thermostat in fleet]
+    endpoint_clients = [protocol.AsyncThermostat(thermostat.host, port=thermostat.port) for thermostat in fleet]
+    transport = protocol.FleetTransport()
+    fleet_clients = [
+        protocol.AsyncThermostat(thermostat.host, port=thermostat.port, fleet=transport) for thermostat in fleet
+    ]
+
+    async def async_broadlink_cycle():
+        await asyncio.gather(*(
+            hass.async_add_executor_job(thermostat.run, ('get_full_status',)) for thermostat in thermostats
+        ))
+
+    async def async_native_cycle(clients):
+        await asyncio.gather(*(client.execute(('get_full_status',)) for client in clients))
+
+    transports = {
+        'broadlink, socket per packet': async_broadlink_cycle,
+        'asyncio, endpoint per host': lambda: async_native_cycle(endpoint_clients),
+        'asyncio, shared fleet socket': lambda: async_native_cycle(fleet_clients)
+    }
+
+    results = {}
+    try:
+        for name, async_cycle in transports.items():
+            for cycle in ('first', 'steady'):
+                counted_sockets.clear()
+                await async_cycle()
+                results[name, cycle] = Counter(counted_sockets)
+                report(
+                    'Socket calls of {0} poll cycle, {1}'.format(cycle, name), fleet,
+                    sockets=results[name, cycle]['socket'],
+                    **{syscall: results[name, cycle][syscall] for syscall in SYSCALLS if results[name, cycle][syscall]},
+                    calls_per_host=round(sum(results[name, cycle].values()) / len(fleet), 1)
+                )
+    finally:
+        for client in endpoint_clients + fleet_clients:
+            client.close()
+        transport.close()
+
+    assert results['asyncio, shared fleet socket', 'first']['socket'] == 1
+    assert results['asyncio, shared fleet socket', 'steady']['socket'] == 0
+    assert results['broadlink, socket per packet', 'steady']['socket'] >= len(fleet)
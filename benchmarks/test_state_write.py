@@ -0,0 +1,50 @@
+"""State write cost of climate entity"""
+import timeit
+
+from homeassistant.const import Platform, UnitOfTemperature
+
+from benchmarks.harness import async_poll, async_setup_fleet, report
+from custom_components.floureon import DATA_ENTITIES, DOMAIN
+from tests.simulator import SimulatedFleet
+
+ITERATIONS = 10000
+
+
+def get_converter():
+    """Converter lookup run on every min_temp / max_temp read before it was resolved at import"""
+    try:
+        from homeassistant.util.unit_conversion import TemperatureConverter
+        return TemperatureConverter.convert
+    except ImportError:
+        from homeassistant.util.temperature import convert
+        return convert
+
+
+def microseconds(func) -> float:
+    return round(timeit.timeit(func, number=ITERATIONS) / ITERATIONS * 1e6, 2)
+
+
+async def test_climate_state_write(hass) -> None:
+    with SimulatedFleet(1) as fleet:
+        coordinators = await async_setup_fleet(hass, fleet, [Platform.CLIMATE])
+        await async_poll(coordinators, 1)
+
+    entity = hass.data[DOMAIN][DATA_ENTITIES]['climate.bench_climate_0']
+    status = entity.status
+
+    def read_limits_uncached():
+        return (
+            get_converter()(status.svl, UnitOfTemperature.CELSIUS, entity.temperature_unit),
+            get_converter()(status.svh, UnitOfTemperature.CELSIUS, entity.temperature_unit)
+        )
+
+    report(
+        'FloureonClimate state write cost', fleet,
+        temp_limits_per_read_import_us=microseconds(read_limits_uncached),
+        temp_limits_cached_us=microseconds(lambda: (entity.min_temp, entity.max_temp)),
+        state_snapshot_us=microseconds(entity.state_snapshot),
+        state_write_us=microseconds(entity.async_write_ha_state),
+        coordinator_update_suppressed_us=microseconds(entity._handle_coordinator_update)
+    )
+
+    assert entity.min_temp == status.svl and entity.max_temp == status.svh
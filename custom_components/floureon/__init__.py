@@ -1,14 +1,59 @@
+import asyncio
 import broadlink
 import logging
+import random
+import threading
 import time
-from datetime import datetime
+from collections import deque
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
 
+import voluptuous as vol
+
+from homeassistant.components.climate.const import (
+    ATTR_HVAC_MODE,
+    ATTR_PRESET_MODE,
+    HVACMode,
+    PRESET_AWAY,
+    PRESET_NONE
+)
 from homeassistant.const import (
-    PRECISION_HALVES
+    ATTR_TEMPERATURE,
+    EVENT_HOMEASSISTANT_STOP,
+    PRECISION_HALVES,
+    Platform
 )
+from homeassistant.core import SupportsResponse, callback
+from homeassistant.helpers import discovery
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.service import async_extract_entity_ids
+from homeassistant.helpers.storage import STORAGE_DIR
+from homeassistant.util import slugify
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from homeassistant.helpers.start import async_at_started
+from homeassistant.helpers.update_coordinator import CoordinatorEntity, DataUpdateCoordinator, UpdateFailed
+
+import homeassistant.helpers.config_validation as cv
+
+from custom_components.floureon import protocol
+from custom_components.floureon.history import StatusHistory
 
 _LOGGER = logging.getLogger(__name__)
 
+DOMAIN = 'floureon'
+
+DATA_COORDINATORS = 'coordinators'
+DATA_POLLER = 'poller'
+DATA_CONFIG = 'config'
+DATA_ENTITIES = 'entities'
+DATA_TRANSPORT = 'transport'
+
+SERVICE_BULK_APPLY = 'bulk_apply'
+SERVICE_SET_SCHEDULE = 'set_schedule'
+
+ATTR_WEEKDAY = 'weekday'
+ATTR_WEEKEND = 'weekend'
+
 BROADLINK_ACTIVE = 1
 BROADLINK_IDLE = 0
 BROADLINK_POWER_ON = 1
@@ -22,57 +67,1171 @@ BROADLINK_TEMP_AUTO = 0
 BROADLINK_TEMP_MANUAL = 1
 
 CONF_HOST = 'host'
+CONF_PORT = 'port'
 CONF_USE_EXTERNAL_TEMP = 'use_external_temp'
 CONF_SCHEDULE = 'schedule'
 CONF_UNIQUE_ID = 'unique_id'
 CONF_PRECISION = 'precision'
 CONF_USE_COOLING = 'use_cooling'
+CONF_MIN_SCAN_INTERVAL = 'min_scan_interval'
+CONF_MAX_SCAN_INTERVAL = 'max_scan_interval'
+CONF_MAX_CONCURRENT_POLLS = 'max_concurrent_polls'
+CONF_CLOCK_SYNC_INTERVAL = 'clock_sync_interval'
+CONF_CLOCK_SYNC_WINDOW = 'clock_sync_window'
+CONF_CLOCK_DRIFT_THRESHOLD = 'clock_drift_threshold'
+CONF_LISTEN_INTERVAL = 'listen_interval'
+CONF_HISTORY_SIZE = 'history_size'
+CONF_HISTORY_WINDOW = 'history_window'
+CONF_HISTORY_FILE = 'history_file'
+CONF_MAC = 'mac'
+CONF_DEVTYPE = 'devtype'
+CONF_KEY = 'key'
+CONF_DEVICE_ID = 'device_id'
 
 DEFAULT_SCHEDULE = 0
 DEFAULT_USE_EXTERNAL_TEMP = True
 DEFAULT_PRECISION = PRECISION_HALVES
 DEFAULT_USE_COOLING = False
+DEFAULT_SCAN_INTERVAL = timedelta(seconds=30)
+DEFAULT_MIN_SCAN_INTERVAL = timedelta(seconds=10)
+DEFAULT_MAX_SCAN_INTERVAL = timedelta(minutes=5)
+DEFAULT_FULL_STATUS_INTERVAL = timedelta(minutes=10)
+DEFAULT_TIMEOUT = 10
+DEFAULT_COMMAND_DELAY = 0.5
+DEFAULT_MAX_CONCURRENT_POLLS = 4
+DEFAULT_PORT = 80
+DEFAULT_CLOCK_SYNC_INTERVAL = timedelta(hours=1)
+DEFAULT_CLOCK_SYNC_WINDOW = timedelta(hours=6)
+DEFAULT_CLOCK_DRIFT_THRESHOLD = 60
+DEFAULT_LISTEN_INTERVAL = timedelta(0)
+DEFAULT_HISTORY_SIZE = 2880
+DEFAULT_HISTORY_WINDOW = timedelta(hours=1)
+DEFAULT_HISTORY_FILE = False
 
+# Delay of first clock check, lets every host read its full status first
+CLOCK_SYNC_STARTUP_DELAY = timedelta(minutes=2)
+
+SECONDS_PER_WEEK = 7 * 24 * 60 * 60
+
+# Relative random deviation of poll interval, keeps hosts from polling in sync
+POLL_JITTER = 0.1
+
+# Number of recent poll latencies kept for percentiles
+LATENCY_SAMPLES = 100
+
+# Polls started within this window of the first one make up a fleet poll cycle
+POLL_CYCLE_WINDOW = DEFAULT_MIN_SCAN_INTERVAL
+
+# Upper bounds (seconds) of call latency histogram buckets, last bucket is unbounded
+LATENCY_BUCKETS = [0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]
+
+BREAKER_HEALTHY = 'healthy'
+BREAKER_DEGRADED = 'degraded'
+BREAKER_OPEN = 'open'
+BREAKER_THRESHOLD = 3
+BREAKER_MIN_BACKOFF = timedelta(seconds=30)
+BREAKER_MAX_BACKOFF = timedelta(hours=1)
+# Backoff doublings past threshold, BREAKER_MIN_BACKOFF doubled this many times exceeds BREAKER_MAX_BACKOFF
+BREAKER_MAX_DOUBLINGS = 8
+
+# Platforms of config entry thermostats
+ENTRY_PLATFORMS = [Platform.CLIMATE, Platform.SENSOR]
+
+# Order in which merged commands are written
+COMMAND_ORDER = ['set_power', 'set_mode', 'set_temp']
+
+# Status fields, same as broadlink hysen get_full_status() keys
+STATUS_FIELDS = (
+    'remote_lock', 'power', 'active', 'temp_manual', 'room_temp', 'thermostat_temp', 'auto_mode', 'loop_mode',
+    'sensor', 'osv', 'dif', 'svh', 'svl', 'room_temp_adj', 'fre', 'poweron', 'unknown', 'external_temp',
+    'hour', 'min', 'sec', 'dayofweek', 'weekday', 'weekend'
+)
+
+# Status fields which changes speed up polling
+ADAPTIVE_POLL_KEYS = ['power', 'active', 'auto_mode', 'room_temp', 'external_temp', 'thermostat_temp']
+
+
+CONFIG_SCHEMA = vol.Schema({
+    vol.Optional(DOMAIN, default={}): vol.Schema({
+        vol.Optional(CONF_MAX_CONCURRENT_POLLS, default=DEFAULT_MAX_CONCURRENT_POLLS): cv.positive_int,
+        vol.Optional(CONF_CLOCK_SYNC_INTERVAL, default=DEFAULT_CLOCK_SYNC_INTERVAL): cv.time_period,
+        vol.Optional(CONF_CLOCK_SYNC_WINDOW, default=DEFAULT_CLOCK_SYNC_WINDOW): cv.time_period,
+        vol.Optional(CONF_CLOCK_DRIFT_THRESHOLD, default=DEFAULT_CLOCK_DRIFT_THRESHOLD): cv.positive_int,
+        vol.Optional(CONF_LISTEN_INTERVAL, default=DEFAULT_LISTEN_INTERVAL): cv.time_period,
+        vol.Optional(CONF_HISTORY_SIZE, default=DEFAULT_HISTORY_SIZE): vol.All(int, vol.Range(min=2)),
+        vol.Optional(CONF_HISTORY_WINDOW, default=DEFAULT_HISTORY_WINDOW): cv.positive_time_period,
+        vol.Optional(CONF_HISTORY_FILE, default=DEFAULT_HISTORY_FILE): cv.boolean
+    })
+}, extra=vol.ALLOW_EXTRA)
+
+def bulk_apply_modes(value):
+    """Validate temperature and preset are combined only with manual heating modes.
+    Both switch thermostat on in manual mode, overriding off or auto mode of the same call.
+    """
+    hvac_mode = value.get(ATTR_HVAC_MODE)
+    if hvac_mode in (HVACMode.OFF, HVACMode.AUTO) and (ATTR_TEMPERATURE in value or ATTR_PRESET_MODE in value):
+        raise vol.Invalid('{0} and {1} can not be applied with hvac mode {2}'.format(
+            ATTR_TEMPERATURE, ATTR_PRESET_MODE, hvac_mode
+        ))
+
+    return value
+
+
+BULK_APPLY_SCHEMA = vol.All(
+    cv.make_entity_service_schema({
+        vol.Optional(ATTR_HVAC_MODE): vol.In([HVACMode.AUTO, HVACMode.HEAT, HVACMode.HEAT_COOL, HVACMode.OFF]),
+        vol.Exclusive(ATTR_TEMPERATURE, 'target'): vol.Coerce(float),
+        vol.Exclusive(ATTR_PRESET_MODE, 'target'): vol.In([PRESET_NONE, PRESET_AWAY])
+    }),
+    cv.has_at_least_one_key(ATTR_HVAC_MODE, ATTR_TEMPERATURE, ATTR_PRESET_MODE),
+    bulk_apply_modes
+)
+
+SCHEDULE_PERIOD_SCHEMA = vol.Schema({
+    vol.Required('start_hour'): vol.All(vol.Coerce(int), vol.Range(min=0, max=23)),
+    vol.Required('start_minute'): vol.All(vol.Coerce(int), vol.Range(min=0, max=59)),
+    vol.Required('temp'): vol.All(vol.Coerce(float), vol.Range(min=0, max=127.5))
+})
+
+SET_SCHEDULE_SCHEMA = vol.All(
+    cv.make_entity_service_schema({
+        vol.Optional(ATTR_WEEKDAY): vol.All([SCHEDULE_PERIOD_SCHEMA], vol.Length(min=6, max=6)),
+        vol.Optional(ATTR_WEEKEND): vol.All([SCHEDULE_PERIOD_SCHEMA], vol.Length(min=2, max=2))
+    }),
+    cv.has_at_least_one_key(ATTR_WEEKDAY, ATTR_WEEKEND)
+)
+
+
+async def async_setup(hass, config) -> bool:
+    """Set up fleet wide poller and clock synchronisation"""
+    conf = config.get(DOMAIN, {})
+    hass.data.setdefault(DOMAIN, {})[DATA_CONFIG] = config
+    hass.data[DOMAIN][DATA_POLLER] = FleetPoller(
+        conf.get(CONF_MAX_CONCURRENT_POLLS, DEFAULT_MAX_CONCURRENT_POLLS)
+    )
+
+    async def async_sync_clocks(*args) -> None:
+        await async_sync_thermostat_clocks(
+            hass,
+            conf.get(CONF_CLOCK_DRIFT_THRESHOLD, DEFAULT_CLOCK_DRIFT_THRESHOLD),
+            conf.get(CONF_CLOCK_SYNC_WINDOW, DEFAULT_CLOCK_SYNC_WINDOW)
+        )
+
+    async_call_later(hass, CLOCK_SYNC_STARTUP_DELAY, async_sync_clocks)
+    async_track_time_interval(hass, async_sync_clocks, conf.get(CONF_CLOCK_SYNC_INTERVAL, DEFAULT_CLOCK_SYNC_INTERVAL))
+
+    async def async_bulk_apply(call):
+        return await async_bulk_apply_service(hass, call)
+
+    async def async_set_schedule(call):
+        return await async_set_schedule_service(hass, call)
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_BULK_APPLY, async_bulk_apply, schema=BULK_APPLY_SCHEMA, supports_response=SupportsResponse.OPTIONAL
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_SET_SCHEDULE, async_set_schedule, schema=SET_SCHEDULE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL
+    )
+
+    return True
+
+
+async def async_setup_entry(hass, entry) -> bool:
+    """Set up thermostat from config entry"""
+
+    @callback
+    def async_migrate_unique_id(entity_entry):
+        # Sensors of config entries were keyed by host before
+        prefix = '{0}_'.format(entry.data[CONF_HOST])
+        if entity_entry.unique_id.startswith(prefix):
+            return {'new_unique_id': '{0}_{1}'.format(entry.unique_id, entity_entry.unique_id[len(prefix):])}
+
+        return None
+
+    await er.async_migrate_entries(hass, entry.entry_id, async_migrate_unique_id)
+    async_get_coordinator(hass, entry.data, load_sensors=False, key=entry.unique_id)
+    await hass.config_entries.async_forward_entry_setups(entry, ENTRY_PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+
+    return True
+
+
+async def async_unload_entry(hass, entry) -> bool:
+    """Unload config entry"""
+    unloaded = await hass.config_entries.async_unload_platforms(entry, ENTRY_PLATFORMS)
+    if unloaded:
+        coordinator = hass.data[DOMAIN][DATA_COORDINATORS].pop(entry.unique_id, None)
+        if coordinator is not None:
+            coordinator.async_unload()
+
+    return unloaded
+
+
+async def async_reload_entry(hass, entry) -> None:
+    """Reload config entry when options change"""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+@callback
+def async_get_poller(hass):
+    """Get poller shared by all thermostats"""
+    return hass.data.setdefault(DOMAIN, {}).setdefault(DATA_POLLER, FleetPoller(DEFAULT_MAX_CONCURRENT_POLLS))
+
+
+@callback
+def async_get_transport(hass):
+    """Get datagram socket shared by all thermostats, closed when Home Assistant stops"""
+    data = hass.data.setdefault(DOMAIN, {})
+    if DATA_TRANSPORT not in data:
+        transport = data[DATA_TRANSPORT] = protocol.FleetTransport()
+
+        @callback
+        def async_close(event) -> None:
+            transport.close()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, async_close)
+
+    return data[DATA_TRANSPORT]
+
+
+async def async_sync_thermostat_clocks(hass, threshold, window) -> None:
+    """Set time of drifting thermostats, at most max_concurrent_polls writes at a time"""
+    coordinators = list(hass.data[DOMAIN].get(DATA_COORDINATORS, {}).values())
+    await asyncio.gather(*(coordinator.async_sync_clock(threshold, window) for coordinator in coordinators))
 
-class BroadlinkThermostat:
+
+async def async_extract_host_entities(hass, call) -> dict:
+    """Return climate and switch entities targeted by service call, grouped by host"""
+    entities = hass.data[DOMAIN].get(DATA_ENTITIES, {})
+
+    hosts = {}
+    for entity_id in await async_extract_entity_ids(hass, call):
+        entity = entities.get(entity_id)
+        if entity is not None and hasattr(entity, 'async_bulk_apply'):
+            hosts.setdefault(entity.coordinator.host, []).append(entity)
+
+    return hosts
+
+
+async def async_bulk_apply_service(hass, call) -> dict:
+    """Apply hvac mode, temperature or preset to many thermostats.
+    Entities of the same host are applied together, so their commands are merged into single write.
+    Commands of every host are queued at once, poll slots bound only the writes.
+    """
+    params = {key: call.data[key] for key in (ATTR_HVAC_MODE, ATTR_TEMPERATURE, ATTR_PRESET_MODE) if key in call.data}
+    hosts = await async_extract_host_entities(hass, call)
+
+    async def async_apply(host_entities):
+        return await asyncio.gather(
+            *(entity.async_bulk_apply(**params) for entity in host_entities), return_exceptions=True
+        )
+
+    results = {}
+    for host_entities, host_results in zip(hosts.values(), await asyncio.gather(*map(async_apply, hosts.values()))):
+        for entity, result in zip(host_entities, host_results):
+            if isinstance(result, Exception):
+                _LOGGER.error("Thermostat %s bulk apply error: %s", entity.coordinator.host, str(result))
+            results[entity.entity_id] = {'host': entity.coordinator.host, 'success': result is True}
+
+    return {'results': results}
+
+
+async def async_set_schedule_service(hass, call) -> dict:
+    """Set schedule of targeted thermostats, written only where it differs from cached schedule"""
+    hosts = await async_extract_host_entities(hass, call)
+
+    async def async_set(host_entities):
+        return await host_entities[0].coordinator.async_set_schedule(
+            call.data.get(ATTR_WEEKDAY), call.data.get(ATTR_WEEKEND)
+        )
+
+    results = {}
+    for host_entities, result in zip(hosts.values(), await asyncio.gather(*map(async_set, hosts.values()))):
+        for entity in host_entities:
+            results[entity.entity_id] = {'host': entity.coordinator.host, 'success': result}
+
+    return {'results': results}
+
+
+@callback
+def async_get_coordinator(hass, config, load_sensors=True, key=None):
+    """Get coordinator shared by all entities of the same host.
+    Config entry coordinators are keyed by entry unique id (MAC address), so they survive host address changes.
+    """
+    host = config.get(CONF_HOST)
+    key = key or host
+    min_interval = config.get(CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL)
+    max_interval = config.get(CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL)
+
+    coordinators = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_COORDINATORS, {})
+    if key not in coordinators:
+        conf = hass.data[DOMAIN].get(DATA_CONFIG, {}).get(DOMAIN, {})
+        history_path = None
+        if conf.get(CONF_HISTORY_FILE, DEFAULT_HISTORY_FILE):
+            history_path = hass.config.path(STORAGE_DIR, 'floureon_history_{0}.bin'.format(slugify(key)))
+        coordinator = coordinators[key] = FloureonCoordinator(
+            hass, host, min_interval, max_interval,
+            unique_id=key,
+            listen_interval=conf.get(CONF_LISTEN_INTERVAL, DEFAULT_LISTEN_INTERVAL),
+            history=StatusHistory(
+                conf.get(CONF_HISTORY_SIZE, DEFAULT_HISTORY_SIZE),
+                conf.get(CONF_HISTORY_WINDOW, DEFAULT_HISTORY_WINDOW).total_seconds()
+            ),
+            history_path=history_path,
+            mac=bytes.fromhex(config[CONF_MAC]) if CONF_MAC in config else None,
+            devtype=config.get(CONF_DEVTYPE),
+            key=bytes.fromhex(config[CONF_KEY]) if CONF_KEY in config else None,
+            device_id=config.get(CONF_DEVICE_ID, 0),
+            port=config.get(CONF_PORT, DEFAULT_PORT)
+        )
+
+        @callback
+        def async_warm_up(hass) -> None:
+            # Spread first polls of all hosts across the shortest interval
+            async_call_later(hass, random.uniform(0, coordinator.min_interval.total_seconds()),
+                             coordinator.async_initial_refresh)
+
+        # Connect once Home Assistant has started, entities come up with restored state until then
+        async_at_started(hass, async_warm_up)
+        # Diagnostic sensors of YAML configured thermostats
+        if load_sensors:
+            hass.async_create_task(discovery.async_load_platform(
+                hass, Platform.SENSOR, DOMAIN, {CONF_HOST: host}, hass.data[DOMAIN].get(DATA_CONFIG, {})
+            ))
+    else:
+        # Most responsive configuration of the host entities wins
+        coordinators[key].set_intervals(
+            min(coordinators[key].min_interval, min_interval),
+            min(coordinators[key].max_interval, max_interval)
+        )
+
+    return coordinators[key]
+
+
+def percentile_ms(samples, p):
+    """Return percentile of samples in seconds, as milliseconds"""
+    samples = sorted(samples)
+    return round(samples[int(p * (len(samples) - 1))] * 1000, 1) if samples else None
+
+
+def half_degrees(temp) -> float:
+    """Return temperature as thermostat stores it, truncated to half degrees"""
+    return int(float(temp) * 2) / 2
+
+
+class FleetPoller:
+    """Limit concurrent thermostat polls, measure time polls wait for a slot and fleet poll cycles.
+    A cycle holds every poll started within POLL_CYCLE_WINDOW of its first one, as hosts poll on their own intervals.
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.semaphore = asyncio.Semaphore(limit)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.wait_time = deque(maxlen=LATENCY_SAMPLES)
+        self.cycle_start = None
+        self.cycle_end = None
+        self.cycle_polls = 0
+        self.last_cycle_time = None
+        self.last_cycle_polls = 0
+
+    def _start_cycle(self, now) -> None:
+        if self.cycle_start is not None and self.cycle_end is not None:
+            self.last_cycle_time = self.cycle_end - self.cycle_start
+            self.last_cycle_polls = self.cycle_polls
+            _LOGGER.debug("Polled %s thermostats in %.2f seconds", self.last_cycle_polls, self.last_cycle_time)
+
+        self.cycle_start = now
+        self.cycle_end = None
+        self.cycle_polls = 0
+
+    @asynccontextmanager
+    async def async_poll(self):
+        """Wait for poll slot"""
+        start = time.monotonic()
+        if self.cycle_start is None or start - self.cycle_start > POLL_CYCLE_WINDOW.total_seconds():
+            self._start_cycle(start)
+        self.cycle_polls += 1
+
+        async with self.semaphore:
+            self.wait_time.append(time.monotonic() - start)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            try:
+                yield
+            finally:
+                self.in_flight -= 1
+                self.cycle_end = time.monotonic()
+
+    @property
+    def stats(self) -> dict:
+        """Return slot wait percentiles and last complete cycle"""
+        return {
+            'limit': self.limit,
+            'in_flight': self.in_flight,
+            'max_in_flight': self.max_in_flight,
+            'wait_p50_ms': percentile_ms(self.wait_time, 0.5),
+            'wait_p99_ms': percentile_ms(self.wait_time, 0.99),
+            'cycle_polls': self.last_cycle_polls,
+            'cycle_time': round(self.last_cycle_time, 2) if self.last_cycle_time is not None else None
+        }
+
+
+class ThermostatMetrics:
+    """Latency histogram and error counters of every thermostat call"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.auth_failures = 0
+        self.latency_sum = 0.0
+        self.latency_buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    @property
+    def latency_mean(self):
+        """Return mean call latency in milliseconds"""
+        return round(self.latency_sum / self.calls * 1000, 1) if self.calls else None
+
+    @property
+    def histogram(self) -> dict:
+        """Return latency histogram keyed by bucket upper bound"""
+        return {
+            'le_{0}'.format(bound): count for bound, count in zip(LATENCY_BUCKETS + ['inf'], self.latency_buckets)
+        }
+
+    def record(self, latency, error=None) -> None:
+        self.calls += 1
+        self.latency_sum += latency
+        self.latency_buckets[next(
+            (i for i, bound in enumerate(LATENCY_BUCKETS) if latency <= bound), len(LATENCY_BUCKETS)
+        )] += 1
+
+        if error is None:
+            return
+
+        self.errors += 1
+        if isinstance(error, (asyncio.TimeoutError, asyncio.CancelledError, broadlink.exceptions.NetworkTimeoutError)):
+            self.timeouts += 1
+        elif isinstance(error, (protocol.ThermostatAuthError,
+                                broadlink.exceptions.AuthenticationError,
+                                broadlink.exceptions.AuthorizationError)):
+            self.auth_failures += 1
+
+
+class CircuitBreaker:
+    """Thermostat health, calls are rejected while circuit is open except occasional probes"""
 
     def __init__(self, host):
+        self.host = host
+        self.state = BREAKER_HEALTHY
+        self.failures = 0
+        self.backoff = None
+        self.probe_time = None
+
+    def allow(self) -> bool:
+        """Check if call is allowed, when open allow single probe after backoff"""
+        if self.state != BREAKER_OPEN:
+            return True
+
+        now = time.monotonic()
+        if now < self.probe_time:
+            return False
+
+        # Reject other calls until probe completes
+        self.probe_time = now + self.backoff.total_seconds()
+        return True
+
+    def success(self) -> None:
+        if self.state != BREAKER_HEALTHY:
+            _LOGGER.info("Thermostat %s is healthy again", self.host)
+
+        self.state = BREAKER_HEALTHY
+        self.failures = 0
+        self.backoff = None
+
+    def failure(self) -> None:
+        self.failures += 1
+        if self.failures < BREAKER_THRESHOLD:
+            self.state = BREAKER_DEGRADED
+            return
+
+        self.state = BREAKER_OPEN
+        doublings = min(self.failures - BREAKER_THRESHOLD, BREAKER_MAX_DOUBLINGS)
+        self.backoff = min(BREAKER_MIN_BACKOFF * 2 ** doublings, BREAKER_MAX_BACKOFF)
+        self.probe_time = time.monotonic() + self.backoff.total_seconds()
+        _LOGGER.debug("Thermostat %s circuit is open, next probe in %s", self.host, self.backoff)
+
+
+class ThermostatSession:
+    """Authenticated device shared by every thermostat instance of the same host"""
+
+    def __init__(self):
+        self.device = None
+        self.lock = threading.Lock()
+        self.cache_hits = 0
+        self.reauths = 0
+        self.retries = 0
+
+
+class BroadlinkThermostat:
+
+    _sessions = {}
+    _sessions_lock = threading.Lock()
+
+    def __init__(self, host, mac=None, devtype=None, key=None, device_id=0, port=DEFAULT_PORT):
         self._host = host
+        self._port = port
+        self._mac = mac
+        self._devtype = devtype
+        self._key = key
+        self._device_id = device_id
+
+    @property
+    def session(self) -> ThermostatSession:
+        """Return session shared between thermostats of the same host"""
+        with self._sessions_lock:
+            if self._host not in self._sessions:
+                self._sessions[self._host] = ThermostatSession()
+            return self._sessions[self._host]
 
     def device(self):
+        if self._mac is not None and self._devtype is not None:
+            # Known identity, skip discovery
+            return broadlink.gendevice(self._devtype, (self._host, self._port), self._mac)
+
         max_attempt = 3
         for attempt in range(0, max_attempt):
             try:
                 attempt += 1
                 broadlink.timeout = 1
-                return broadlink.hello(self._host, timeout=3)
+                return broadlink.hello(self._host, port=self._port, timeout=3)
             except broadlink.exceptions.NetworkTimeoutError as e:
+                self.session.retries += 1
                 if attempt == max_attempt:
                     _LOGGER.error("Thermostat %s network error: %s", self._host, str(e))
 
-    def set_time(self):
-        """Set thermostat time"""
+    def authenticate(self):
+        """Discover and authenticate thermostat"""
+        device = self.device()
+        if device is not None and self._key is not None:
+            # Reuse stored session key once, authenticate again when it has expired
+            device.id = self._device_id
+            device.update_aes(self._key)
+            self._key = None
+            return device
+
+        if device is None or not device.auth():
+            raise broadlink.exceptions.AuthenticationError(-1, "Thermostat authentication failed")
+
+        return device
+
+    def call(self, callback):
+        """Call callback with cached authenticated device, re-authenticate once on auth or timeout error"""
+        session = self.session
+        with session.lock:
+            while True:
+                reauth = session.device is None
+                if reauth:
+                    session.device = self.authenticate()
+                    session.reauths += 1
+                    _LOGGER.debug("Thermostat %s authenticated, re-auth count: %s", self._host, session.reauths)
+                else:
+                    session.cache_hits += 1
+
+                try:
+                    return callback(session.device)
+                except (broadlink.exceptions.AuthenticationError,
+                        broadlink.exceptions.AuthorizationError,
+                        broadlink.exceptions.ConnectionClosedError,
+                        broadlink.exceptions.NetworkTimeoutError):
+                    session.device = None
+                    if reauth:
+                        raise
+
+    def run(self, *commands) -> list:
+        """Run commands, ex. ('set_temp', 20.5), in a single session and return their results"""
+        return self.call(lambda device: [self.run_command(device, command, *args) for command, *args in commands])
+
+    @staticmethod
+    def run_command(device, command, *args):
+        """Run single device command"""
+        if command == 'get_status':
+            # Status registers only, without time and schedule
+            return protocol.decode_status(device.send_request(protocol.REQUEST_STATUS))
+
+        return getattr(device, command)(*args)
+
+
+class ThermostatStatus:
+    """Fixed layout thermostat status, single record per host read by every entity.
+    Schedule periods are kept as (start_hour, start_minute, temp) tuples, temp in half degrees as thermostat stores it.
+    """
+
+    __slots__ = STATUS_FIELDS
+
+    def __init__(self, **fields):
+        for field in STATUS_FIELDS:
+            setattr(self, field, None)
+        self.update(fields)
+
+    def update(self, fields) -> None:
+        """Set fields, ignoring ones outside status layout (newer broadlink versions report extra keys)"""
+        for field, value in fields.items():
+            if field not in STATUS_FIELDS:
+                continue
+            if field in ('weekday', 'weekend'):
+                value = tuple(
+                    (period['start_hour'], period['start_minute'], half_degrees(period['temp'])) for period in value
+                )
+            setattr(self, field, value)
+
+    @staticmethod
+    def schedule_periods(periods) -> list:
+        """Return schedule periods as broadlink hysen dicts"""
+        return [{'start_hour': hour, 'start_minute': minute, 'temp': temp} for hour, minute, temp in periods]
+
+    def replace(self, **fields):
+        """Return copy with fields replaced"""
+        status = ThermostatStatus()
+        for field in STATUS_FIELDS:
+            setattr(status, field, getattr(self, field))
+        status.update(fields)
+        return status
+
+    def as_dict(self) -> dict:
+        return {field: getattr(self, field) for field in STATUS_FIELDS}
+
+
+class FloureonCoordinator(DataUpdateCoordinator):
+    """Fetch thermostat status once per interval for every entity of the host"""
+
+    def __init__(self, hass, host, min_interval=DEFAULT_MIN_SCAN_INTERVAL, max_interval=DEFAULT_MAX_SCAN_INTERVAL,
+                 listen_interval=DEFAULT_LISTEN_INTERVAL, history=None, history_path=None, unique_id=None, **identity):
+        super().__init__(hass, _LOGGER, name='{0} {1}'.format(DOMAIN, host), update_interval=DEFAULT_SCAN_INTERVAL)
+        self.host = host
+        self.unique_id = unique_id or host
+        self.poller = async_get_poller(hass)
+        self.breaker = CircuitBreaker(host)
+        self.metrics = ThermostatMetrics()
+        self.interval = DEFAULT_SCAN_INTERVAL
+        self.min_interval = None
+        self.max_interval = None
+        self.set_intervals(min_interval, max_interval)
+        self.thermostat = BroadlinkThermostat(host, **identity)
+        self.client = None
+        if protocol.SUPPORTED:
+            self.client = protocol.AsyncThermostat(host, fleet=async_get_transport(hass), **identity)
+        self.listen_interval = listen_interval
+        self._listener = None
+        self.listener_updates = 0
+        self.history = history or StatusHistory(DEFAULT_HISTORY_SIZE, DEFAULT_HISTORY_WINDOW.total_seconds())
+        self.history_path = history_path
+        self._full_status_time = None
+        self._commands = {}
+        self._commands_result = None
+        self.optimistic = {}
+        self.commands_rejected = 0
+        self.commands_sent = 0
+        self.commands_coalesced = 0
+        self.commands_skipped = 0
+        self.polls = 0
+        self.poll_latency = deque(maxlen=LATENCY_SAMPLES)
+        self.executor_jobs = 0
+        self.executor_active = 0
+        self.client_fallbacks = 0
+        self.suppressed_writes = 0
+        self.clock_drift = None
+        self.clock_syncs = 0
+        self._clock_sync_time = None
+        self.warmed_up = False
+        self.started = time.monotonic()
+        self._remove_stop_listener = hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, self.async_close)
+
+    def set_intervals(self, min_interval, max_interval) -> None:
+        """Set adaptive polling interval limits"""
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.set_interval(min(max(self.interval, self.min_interval), self.max_interval))
+
+    def set_interval(self, interval) -> None:
+        """Set poll interval with random jitter"""
+        self.interval = interval
+        self.update_interval = interval * random.uniform(1 - POLL_JITTER, 1 + POLL_JITTER)
+
+    def adapt_interval(self, previous, data) -> None:
+        """Poll faster while thermostat state is changing, back off while it is stable or powered off"""
+        if data.power == BROADLINK_POWER_OFF:
+            interval = self.max_interval
+        elif previous is None or any(getattr(previous, key) != getattr(data, key) for key in ADAPTIVE_POLL_KEYS):
+            interval = self.min_interval
+        else:
+            interval = min(self.interval * 2, self.max_interval)
+
+        if interval != self.interval:
+            _LOGGER.debug("Thermostat %s poll interval changed to %s", self.host, interval)
+
+        self.set_interval(interval)
+
+    async def async_initial_refresh(self, *args) -> None:
+        """Start polling, run first refresh unless entities have already requested one"""
+        self.warmed_up = True
+        if self.history_path is not None:
+            try:
+                await self.hass.async_add_executor_job(self.history.open, self.history_path, time.time())
+            except (OSError, ValueError) as e:
+                _LOGGER.warning("Thermostat %s history file %s error: %s", self.host, self.history_path, str(e))
+
+        if self.client is not None and self.listen_interval.total_seconds() > 0 and self._listener is None:
+            self._listener = self.hass.async_create_background_task(
+                self._async_listen(), 'floureon listener {0}'.format(self.host)
+            )
+
+        if self.data is None:
+            await self.async_refresh()
+        else:
+            self._schedule_refresh()
+
+    async def _async_listen(self) -> None:
+        """Read fast status between polls over the open session, pushing changes to entities right away"""
+        while self.client is not None:
+            await asyncio.sleep(self.listen_interval.total_seconds())
+            client = self.client
+            if client is None or self.data is None or self.breaker.state == BREAKER_OPEN:
+                continue
+
+            start = time.monotonic()
+            try:
+                async with self.poller.semaphore:
+                    status, = await asyncio.wait_for(client.execute(('get_status',)), DEFAULT_TIMEOUT)
+            except Exception as e:
+                # Polling reports errors, listener just skips a beat
+                self.metrics.record(time.monotonic() - start, e)
+                _LOGGER.debug("Thermostat %s listener error: %s", self.host, str(e))
+                continue
+
+            self.metrics.record(time.monotonic() - start)
+
+            if self.data is None or all(getattr(self.data, key) == status[key] for key in ADAPTIVE_POLL_KEYS):
+                continue
+
+            _LOGGER.debug("Thermostat %s status changed: %s", self.host, status)
+            self.listener_updates += 1
+            data = self.data.replace(**status)
+            self.record_history(data)
+            self.adapt_interval(self.data, data)
+            self.async_set_updated_data(data)
+
+    @callback
+    def _schedule_refresh(self) -> None:
+        """Schedule next refresh, thermostat is not polled until warm-up"""
+        if self.warmed_up:
+            super()._schedule_refresh()
+
+    async def async_call(self, *commands) -> list:
+        """Run commands and record call latency and errors"""
+        start = time.monotonic()
         try:
-            device = self.device()
-            if device.auth():
-                now = datetime.now()
-                device.set_time(now.hour,
-                                now.minute,
-                                now.second,
-                                now.weekday() + 1)
-                _LOGGER.debug("Thermostat date / time is set")
-        except Exception as e:
-            _LOGGER.error("Thermostat %s set_time error: %s", self._host, str(e))
+            result = await self._async_call(*commands)
+        except (Exception, asyncio.CancelledError) as e:
+            self.metrics.record(time.monotonic() - start, e)
+            raise
+
+        self.metrics.record(time.monotonic() - start)
 
-    def read_status(self):
-        """Read thermostat data"""
-        data = None
+        return result
+
+    async def _async_call(self, *commands) -> list:
+        """Run commands with native asyncio client, falling back to broadlink library in executor"""
+        if self.client is not None:
+            try:
+                return await self.client.execute(*commands)
+            except protocol.ThermostatDataError as e:
+                # Single malformed packet of flaky network, native client is kept for next calls
+                self.client_fallbacks += 1
+                _LOGGER.log(
+                    logging.INFO if self.client_fallbacks == 1 else logging.DEBUG,
+                    "Thermostat %s asyncio client error, falling back to broadlink for this call: %s", self.host, str(e)
+                )
+
+        self.executor_jobs += 1
+        self.executor_active += 1
         try:
-            device = self.device()
-            if device.auth():
-                data = device.get_full_status()
-                _LOGGER.debug("Received %s thermostat data: %s", self._host, data)
+            return await self.hass.async_add_executor_job(self.thermostat.run, *commands)
+        finally:
+            self.executor_active -= 1
+
+    @callback
+    def async_close(self, *args) -> None:
+        """Close native client and history file"""
+        self._remove_stop_listener = None
+        self.async_close_client()
+        self.history.close()
+
+    @callback
+    def async_unload(self) -> None:
+        """Close coordinator of unloaded config entry, it is not closed again when Home Assistant stops"""
+        if self._remove_stop_listener is not None:
+            self._remove_stop_listener()
+        self.async_close()
+
+    @callback
+    def async_close_client(self) -> None:
+        """Stop listener and close native client"""
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+
+        if self.client is not None:
+            self.client.close()
+            self.client = None
+
+    async def _async_update_data(self):
+        """Read thermostat status, schedule and time are refreshed on a slower cadence"""
+        full_status = (
+            self.data is None or
+            self._full_status_time is None or
+            time.monotonic() - self._full_status_time > DEFAULT_FULL_STATUS_INTERVAL.total_seconds()
+        )
+
+        if not self.breaker.allow():
+            raise UpdateFailed('Thermostat {0} is unreachable, circuit is open'.format(self.host))
+
+        try:
+            async with self.poller.async_poll():
+                start = time.monotonic()
+                data, = await asyncio.wait_for(
+                    self.async_call(('get_full_status',) if full_status else ('get_status',)), DEFAULT_TIMEOUT
+                )
+                self.polls += 1
+                self.poll_latency.append(time.monotonic() - start)
+        except asyncio.TimeoutError as e:
+            self.breaker.failure()
+            raise UpdateFailed('Thermostat {0} read_status() timed out'.format(self.host)) from e
         except Exception as e:
-            _LOGGER.warning("Thermostat %s read_status() error: %s", self._host, str(e))
+            self.breaker.failure()
+            raise UpdateFailed('Thermostat {0} read_status() error: {1}'.format(self.host, str(e))) from e
+
+        self.breaker.success()
+
+        _LOGGER.debug("Received %s thermostat data: %s", self.host, data)
+
+        if full_status:
+            self._full_status_time = time.monotonic()
+            data = ThermostatStatus(**data)
+        else:
+            data = self.data.replace(**data)
+
+        self.record_history(data)
+        self.adapt_interval(self.data, data)
+
+        return data
+
+    def record_history(self, data) -> None:
+        """Store temperatures and heating state of read status"""
+        self.history.append(time.time(), data.room_temp, data.external_temp, data.thermostat_temp, data.active)
+
+    @property
+    def retries(self) -> int:
+        """Return number of retransmitted packets and discovery attempts"""
+        return self.thermostat.session.retries + (self.client.retries if self.client is not None else 0)
+
+    @property
+    def cache_hits(self) -> int:
+        """Return number of calls made over cached authenticated session"""
+        return self.thermostat.session.cache_hits + (self.client.cache_hits if self.client is not None else 0)
+
+    @property
+    def reauths(self) -> int:
+        """Return number of thermostat authentications"""
+        return self.thermostat.session.reauths + (self.client.reauths if self.client is not None else 0)
+
+    @property
+    def stats(self) -> dict:
+        """Return poll, call and command queue counters"""
+        return {
+            'polls': self.polls,
+            'polls_per_second': round(self.polls / max(time.monotonic() - self.started, 1), 4),
+            'poll_latency_p50_ms': percentile_ms(self.poll_latency, 0.5),
+            'poll_latency_p99_ms': percentile_ms(self.poll_latency, 0.99),
+            'executor_jobs': self.executor_jobs,
+            'executor_active': self.executor_active,
+            'client_fallbacks': self.client_fallbacks,
+            'calls': self.metrics.calls,
+            'call_latency_mean_ms': self.metrics.latency_mean,
+            'call_latency_histogram': self.metrics.histogram,
+            'errors': self.metrics.errors,
+            'timeouts': self.metrics.timeouts,
+            'auth_failures': self.metrics.auth_failures,
+            'retries': self.retries,
+            'cache_hits': self.cache_hits,
+            'reauths': self.reauths,
+            'commands_sent': self.commands_sent,
+            'commands_coalesced': self.commands_coalesced,
+            'commands_skipped': self.commands_skipped,
+            'commands_rejected': self.commands_rejected,
+            'suppressed_writes': self.suppressed_writes,
+            'listener_updates': self.listener_updates,
+            'clock_drift': self.clock_drift,
+            'clock_syncs': self.clock_syncs,
+            'fleet': self.poller.stats
+        }
+
+    @property
+    def status(self):
+        """Return last read status with pending command changes applied"""
+        if self.data is None or not self.optimistic:
+            return self.data
+
+        return self.data.replace(**self.optimistic)
+
+    async def async_execute(self, *commands) -> bool:
+        """Queue thermostat commands, commands queued within DEFAULT_COMMAND_DELAY are merged into single write.
+        Entities show the commanded state right away, until the write is confirmed or rolled back.
+        """
+        for command, *args in commands:
+            if command in self._commands:
+                self.commands_coalesced += 1
+            self._commands[command] = args
+
+        self.optimistic.update(self.commands_status(commands))
+        self.async_update_listeners()
+
+        if self._commands_result is None:
+            self._commands_result = self.hass.loop.create_future()
+            self.hass.async_create_task(self._async_write_commands())
+
+        return await asyncio.shield(self._commands_result)
+
+    async def _async_write_commands(self) -> None:
+        """Write queued commands, skipping ones already applied on thermostat"""
+        await asyncio.sleep(DEFAULT_COMMAND_DELAY)
+
+        result, self._commands_result = self._commands_result, None
+        queued, self._commands = self._commands, {}
+
+        commands = []
+        for command in sorted(queued, key=lambda c: COMMAND_ORDER.index(c) if c in COMMAND_ORDER else len(COMMAND_ORDER)):
+            if self.is_applied(command, queued[command], commands):
+                self.commands_skipped += 1
+                continue
+            commands.append((command, *queued[command]))
+
+        written = False
+        try:
+            written = await self._async_write(commands)
         finally:
-            return data
+            # Read status is confirmed now, keep changes of commands queued meanwhile
+            for field, value in self.commands_status([(command, *args) for command, args in queued.items()]).items():
+                if self.optimistic.get(field) == value:
+                    del self.optimistic[field]
+            self.async_update_listeners()
+
+            # Service calls waiting for this write never hang, whatever happened to it
+            if not result.done():
+                result.set_result(written)
+
+    def is_applied(self, command, args, commands) -> bool:
+        """Check if command target state matches last read thermostat status"""
+        data = self.data
+        if not data:
+            return False
+
+        if command == 'set_power':
+            return data.power == args[0]
+
+        if command == 'set_mode':
+            auto_mode, loop_mode, sensor = args
+            # Thermostat reports loop mode increased by one
+            return data.auto_mode == auto_mode and data.loop_mode == loop_mode + 1 and data.sensor == sensor
+
+        if command == 'set_temp':
+            # Setting temperature overrides auto mode, so skip only when already in manual mode
+            manual = data.auto_mode == BROADLINK_MODE_MANUAL or data.temp_manual == BROADLINK_TEMP_MANUAL
+            return manual and data.thermostat_temp == half_degrees(args[0]) and not any(c[0] == 'set_mode' for c in commands)
+
+        return False
+
+    @staticmethod
+    def commands_status(commands) -> dict:
+        """Return status fields commands change"""
+        data = {}
+        for command, *args in commands:
+            if command == 'set_power':
+                data['power'] = args[0]
+            elif command == 'set_mode':
+                data['auto_mode'], data['loop_mode'], data['sensor'] = args[0], args[1] + 1, args[2]
+            elif command == 'set_temp':
+                data['thermostat_temp'] = half_degrees(args[0])
+            elif command == 'set_schedule':
+                data['weekday'], data['weekend'] = args
+
+        return data
+
+    async def async_set_schedule(self, weekday=None, weekend=None) -> bool:
+        """Set schedule periods, missing weekday or weekend periods are kept.
+        Nothing is sent when periods match cached schedule, which is refreshed with full status.
+        """
+        if self.data is None or self.data.weekday is None:
+            # Schedule was not read yet
+            self._full_status_time = None
+            await self.async_refresh()
+            if self.data is None or self.data.weekday is None:
+                _LOGGER.error("Thermostat %s schedule is unknown, thermostat is unreachable", self.host)
+                return False
+
+        requested = ThermostatStatus(
+            weekday=weekday or ThermostatStatus.schedule_periods(self.data.weekday),
+            weekend=weekend or ThermostatStatus.schedule_periods(self.data.weekend)
+        )
+        if requested.weekday == self.data.weekday and requested.weekend == self.data.weekend:
+            _LOGGER.debug("Thermostat %s schedule is already set", self.host)
+            self.commands_skipped += 1
+            return True
+
+        return await self.async_execute((
+            'set_schedule',
+            ThermostatStatus.schedule_periods(requested.weekday),
+            ThermostatStatus.schedule_periods(requested.weekend)
+        ))
+
+    async def async_read_back(self, commands) -> None:
+        """Read status after write, confirming commands or rolling back to actual thermostat state"""
+        expected = self.commands_status(commands)
+        try:
+            status, = await asyncio.wait_for(self.async_call(('get_status',)), DEFAULT_TIMEOUT)
+        except Exception as e:
+            # Written successfully, assume applied until next poll
+            _LOGGER.debug("Thermostat %s read back error: %s", self.host, str(e))
+            self.data = self.data.replace(**expected)
+            return
+
+        rejected = {field: status[field] for field, value in expected.items() if field in status and status[field] != value}
+        if rejected:
+            self.commands_rejected += 1
+            _LOGGER.warning("Thermostat %s did not apply %s, actual status: %s", self.host, commands, rejected)
+
+        # Fields outside status registers, like schedule, are assumed applied until next full status
+        self.data = self.data.replace(**{**expected, **status})
+        self.record_history(self.data)
+
+    def read_clock_drift(self):
+        """Return seconds thermostat clock is ahead of local time, based on last full status"""
+        data = self.data
+        if data is None or self._full_status_time is None or data.dayofweek is None:
+            return None
+
+        # Thermostat clock has advanced since full status was read
+        elapsed = time.monotonic() - self._full_status_time
+        device = (data.dayofweek - 1) * 86400 + data.hour * 3600 + data.min * 60 + data.sec + elapsed
+        now = datetime.now()
+        local = now.weekday() * 86400 + now.hour * 3600 + now.minute * 60 + now.second + now.microsecond / 1e6
+
+        # Thermostat keeps weekday only, so drift wraps around the week
+        return round((device - local + SECONDS_PER_WEEK / 2) % SECONDS_PER_WEEK - SECONDS_PER_WEEK / 2, 1)
+
+    async def async_sync_clock(self, threshold, window) -> bool:
+        """Set thermostat time when its clock drifted beyond threshold, at most once per window"""
+        self.clock_drift = self.read_clock_drift()
+        if self.clock_drift is None or abs(self.clock_drift) <= threshold:
+            return False
+
+        if self._clock_sync_time is not None and time.monotonic() - self._clock_sync_time < window.total_seconds():
+            _LOGGER.debug("Thermostat %s clock drifted %s seconds, already set within %s",
+                          self.host, self.clock_drift, window)
+            return False
+
+        _LOGGER.debug("Thermostat %s clock drifted %s seconds, setting time", self.host, self.clock_drift)
+        self._clock_sync_time = time.monotonic()
+        now = datetime.now()
+        if not await self._async_write([('set_time', now.hour, now.minute, now.second, now.isoweekday())]):
+            return False
+
+        self.clock_syncs += 1
+
+        return True
+
+    async def _async_write(self, commands) -> bool:
+        """Write commands and read them back within a poll slot, never waiting longer than timeout"""
+        if not commands:
+            return True
+
+        if not self.breaker.allow():
+            _LOGGER.error("Thermostat %s is unreachable, circuit is open", self.host)
+            return False
+
+        try:
+            async with self.poller.semaphore:
+                await asyncio.wait_for(self.async_call(*commands), DEFAULT_TIMEOUT)
+                self.breaker.success()
+                self.commands_sent += len(commands)
+                if self.data is not None:
+                    await self.async_read_back(commands)
+            # Refresh full status after writes beyond status registers, poll faster to follow the change
+            if any(command not in COMMAND_ORDER for command, *args in commands):
+                self._full_status_time = None
+            self.set_interval(self.min_interval)
+            self._schedule_refresh()
+            return True
+        except asyncio.TimeoutError:
+            _LOGGER.error("Thermostat %s command timed out after %s seconds", self.host, DEFAULT_TIMEOUT)
+        except Exception as e:
+            _LOGGER.error("Thermostat %s execute error: %s", self.host, str(e))
+
+        self.breaker.failure()
+
+        return False
+
+
+class FloureonEntity(CoordinatorEntity):
+    """Thermostat entity writing its state only when exposed values change"""
+
+    _state_snapshot = None
+    _restored_status = None
+
+    @property
+    def status(self):
+        """Return status shared by every entity of the host, or status restored from last state until first read"""
+        return self.coordinator.status or self._restored_status
+
+    async def async_added_to_hass(self) -> None:
+        """Register entity for integration services"""
+        await super().async_added_to_hass()
+
+        entities = self.hass.data[DOMAIN].setdefault(DATA_ENTITIES, {})
+        entities[self.entity_id] = self
+        self.async_on_remove(lambda: entities.pop(self.entity_id, None))
+
+    def update_from_data(self, data) -> None:
+        """Get thermostat info"""
+
+    def state_snapshot(self) -> tuple:
+        """Return values exposed in entity state"""
+        return (
+            self.available,
+            self.state,
+            *(self.capability_attributes or {}).values(),
+            *(self.state_attributes or {}).values(),
+            *(self.extra_state_attributes or {}).values()
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator"""
+        if self.coordinator.data is not None:
+            self._restored_status = None
+        self.update_from_data(self.coordinator.status)
+
+        if self.state_snapshot() == self._state_snapshot:
+            self.coordinator.suppressed_writes += 1
+            return
+
+        self.async_write_ha_state()
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write state and remember written values"""
+        self._state_snapshot = self.state_snapshot()
+        super().async_write_ha_state()
@@ -1,19 +1,30 @@
 
+import asyncio
 import logging
-from typing import List, Optional
+from typing import Optional
 
 import voluptuous as vol
 
 from custom_components.floureon import (
-    BroadlinkThermostat,
+    async_get_coordinator,
+    FloureonEntity,
+    ThermostatStatus,
     CONF_HOST,
+    CONF_PORT,
     CONF_USE_EXTERNAL_TEMP,
     CONF_SCHEDULE,
     CONF_UNIQUE_ID,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_MAX_SCAN_INTERVAL,
     CONF_PRECISION,
     CONF_USE_COOLING,
+    DATA_COORDINATORS,
+    DOMAIN,
     DEFAULT_SCHEDULE,
     DEFAULT_USE_EXTERNAL_TEMP,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_PORT,
+    DEFAULT_MAX_SCAN_INTERVAL,
     DEFAULT_PRECISION,
     DEFAULT_USE_COOLING,
     BROADLINK_ACTIVE,
@@ -37,9 +48,11 @@ from homeassistant.components.climate import (
 )
 
 from homeassistant.helpers.restore_state import RestoreEntity
-# Unused until HA 2023.4
-# from homeassistant.util.unit_conversion import TemperatureConverter
 from homeassistant.components.climate.const import (
+    ATTR_HVAC_ACTION,
+    ATTR_MAX_TEMP,
+    ATTR_MIN_TEMP,
+    ATTR_PRESET_MODE,
     PRESET_NONE,
     PRESET_AWAY,
     DEFAULT_MIN_TEMP,
@@ -51,20 +64,32 @@ from homeassistant.const import (
     PRECISION_WHOLE,
     PRECISION_TENTHS,
     ATTR_TEMPERATURE,
+    STATE_UNAVAILABLE,
+    STATE_UNKNOWN,
     UnitOfTemperature,
     CONF_NAME
 )
 
 import homeassistant.helpers.config_validation as cv
 
+# Backward compatibility until 2023.4
+try:
+    from homeassistant.util.unit_conversion import TemperatureConverter
+    convert_temperature = TemperatureConverter.convert
+except ImportError:
+    from homeassistant.util.temperature import convert as convert_temperature
+
 _LOGGER = logging.getLogger(__name__)
 
 PARALLEL_UPDATES = 0
 
 PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend({
     vol.Required(CONF_HOST): cv.string,
+    vol.Optional(CONF_PORT, default=DEFAULT_PORT): cv.port,
     vol.Required(CONF_NAME): cv.string,
     vol.Optional(CONF_UNIQUE_ID): cv.string,
+    vol.Optional(CONF_MIN_SCAN_INTERVAL, default=DEFAULT_MIN_SCAN_INTERVAL): cv.positive_time_period,
+    vol.Optional(CONF_MAX_SCAN_INTERVAL, default=DEFAULT_MAX_SCAN_INTERVAL): cv.positive_time_period,
     vol.Optional(CONF_SCHEDULE, default=DEFAULT_SCHEDULE): vol.All(int, vol.Range(min=0, max=2)),
     vol.Optional(CONF_USE_EXTERNAL_TEMP, default=DEFAULT_USE_EXTERNAL_TEMP): cv.boolean,
     vol.Optional(CONF_PRECISION, default=DEFAULT_PRECISION): vol.In([PRECISION_HALVES, PRECISION_WHOLE, PRECISION_TENTHS]),
@@ -74,26 +99,43 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend({
 
 async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
     """Set up the generic thermostat platform."""
-    async_add_entities([FloureonClimate(hass, config)])
-
-
-class FloureonClimate(ClimateEntity, RestoreEntity):
+    coordinator = async_get_coordinator(hass, config)
+    async_add_entities([FloureonClimate(hass, config, coordinator)])
+
+
+async def async_setup_entry(hass, entry, async_add_entities):
+    """Set up thermostat from config entry."""
+    coordinator = hass.data[DOMAIN][DATA_COORDINATORS][entry.unique_id]
+    config = {
+        CONF_NAME: entry.title,
+        CONF_UNIQUE_ID: entry.unique_id,
+        CONF_SCHEDULE: DEFAULT_SCHEDULE,
+        CONF_USE_EXTERNAL_TEMP: DEFAULT_USE_EXTERNAL_TEMP,
+        CONF_PRECISION: DEFAULT_PRECISION,
+        CONF_USE_COOLING: DEFAULT_USE_COOLING,
+        **entry.options
+    }
+    async_add_entities([FloureonClimate(hass, config, coordinator)])
+
+
+class FloureonClimate(FloureonEntity, ClimateEntity, RestoreEntity):
     _enable_turn_on_off_backwards_compatibility = False
+    _attr_temperature_unit = UnitOfTemperature.CELSIUS
+    _attr_preset_modes = [PRESET_NONE, PRESET_AWAY]
+    _attr_supported_features = (
+        ClimateEntityFeature.TARGET_TEMPERATURE | ClimateEntityFeature.PRESET_MODE |
+        ClimateEntityFeature.TURN_OFF | ClimateEntityFeature.TURN_ON
+    )
 
-    def __init__(self, hass, config):
-        self._hass = hass
-        self._thermostat = BroadlinkThermostat(config.get(CONF_HOST))
+    def __init__(self, hass, config, coordinator):
+        super().__init__(coordinator)
 
         self._name = config.get(CONF_NAME)
         self._use_external_temp = config.get(CONF_USE_EXTERNAL_TEMP)
         self._use_cooling = config.get(CONF_USE_COOLING)
 
-        self._min_temp = DEFAULT_MIN_TEMP
-        self._max_temp = DEFAULT_MAX_TEMP
-        self._hysteresis = None
-        self._room_temp = None
-        self._external_temp = None
-        self._precision = config.get(CONF_PRECISION)
+        self._min_temp = None
+        self._max_temp = None
 
         self._away_set_point = DEFAULT_MIN_TEMP
         self._manual_set_point = DEFAULT_MIN_TEMP
@@ -103,30 +145,28 @@ class FloureonClimate(ClimateEntity, RestoreEntity):
         self._thermostat_loop_mode = config.get(CONF_SCHEDULE)
         self._thermostat_current_action = None
         self._thermostat_current_mode = None
-        self._thermostat_current_temp = None
-        self._thermostat_target_temp = None
 
         self._attr_name = self._name
         self._attr_unique_id = config.get(CONF_UNIQUE_ID)
+        self._attr_precision = config.get(CONF_PRECISION)
+        self._attr_hvac_modes = [
+            HVACMode.AUTO, HVACMode.HEAT_COOL if self._use_cooling is True else HVACMode.HEAT, HVACMode.OFF
+        ]
+        self.set_temp_limits(DEFAULT_MIN_TEMP, DEFAULT_MAX_TEMP)
 
     def thermostat_get_sensor(self) -> int:
         """Get sensor to use"""
         return BROADLINK_SENSOR_EXTERNAL if self._use_external_temp is True else BROADLINK_SENSOR_INTERNAL
 
-    @property
-    def name(self) -> str:
-        """Return thermostat name"""
-        return self._name
+    def set_temp_limits(self, min_temp, max_temp) -> None:
+        """Set thermostat temperature limits, converted only when they change"""
+        if min_temp != self._min_temp:
+            self._min_temp = min_temp
+            self._attr_min_temp = convert_temperature(min_temp, UnitOfTemperature.CELSIUS, self.temperature_unit)
 
-    @property
-    def precision(self) -> float:
-        """Return the precision of the system."""
-        return self._precision
-
-    @property
-    def temperature_unit(self) -> str:
-        """Return the unit of measurement."""
-        return UnitOfTemperature.CELSIUS
+        if max_temp != self._max_temp:
+            self._max_temp = max_temp
+            self._attr_max_temp = convert_temperature(max_temp, UnitOfTemperature.CELSIUS, self.temperature_unit)
 
     @property
     def hvac_mode(self) -> str:
@@ -135,16 +175,6 @@ class FloureonClimate(ClimateEntity, RestoreEntity):
         """
         return self._thermostat_current_mode
 
-    @property
-    def hvac_modes(self) -> List[str]:
-        """Return the list of available hvac operation modes.
-        Need to be a subset of HVACMode.
-        """
-        if self._use_cooling is True:
-            return [HVACMode.AUTO, HVACMode.HEAT_COOL, HVACMode.OFF]
-
-        return [HVACMode.AUTO, HVACMode.HEAT, HVACMode.OFF]
-
     @property
     def hvac_action(self) -> Optional[str]:
         """Return the current running hvac operation if supported.
@@ -159,69 +189,40 @@ class FloureonClimate(ClimateEntity, RestoreEntity):
         """
         return self._preset_mode
 
-    @property
-    def preset_modes(self) -> Optional[List[str]]:
-        """Return a list of available preset modes.
-        Requires ClimateEntityFeature.PRESET_MODE.
-        """
-        return [PRESET_NONE, PRESET_AWAY]
-
     @property
     def current_temperature(self) -> Optional[float]:
         """Return the current temperature."""
-        return self._thermostat_current_temp
+        status = self.status
+        if status is None:
+            return None
+
+        return status.external_temp if self._use_external_temp else status.room_temp
 
     @property
     def target_temperature(self) -> Optional[float]:
         """Return the temperature we try to reach."""
-        return self._thermostat_target_temp
-
-    @property
-    def supported_features(self):
-        """Return the list of supported features."""
-        return ClimateEntityFeature.TARGET_TEMPERATURE | ClimateEntityFeature.PRESET_MODE | ClimateEntityFeature.TURN_OFF | ClimateEntityFeature.TURN_ON
-
-    # Backward compatibility until 2023.4
-    def get_converter(self):
-        try:
-            from homeassistant.util.unit_conversion import TemperatureConverter
-            convert = TemperatureConverter.convert
-        except ModuleNotFoundError or ImportError as ee:
-            from homeassistant.util.temperature import convert
-        return convert
-
-    @property
-    def min_temp(self) -> float:
-        """Return the minimum temperature."""
-        return self.get_converter()(self._min_temp, UnitOfTemperature.CELSIUS,
-                                    self.temperature_unit)
-
-    @property
-    def max_temp(self) -> float:
-        """Return the maximum temperature."""
-        return self.get_converter()(self._max_temp, UnitOfTemperature.CELSIUS,
-                                    self.temperature_unit)
+        status = self.status
+        return status.thermostat_temp if status is not None else None
 
     @property
     def extra_state_attributes(self) -> dict:
         """Return the attribute(s) of the sensor"""
+        status = self.status
         return {
             'away_set_point': self._away_set_point,
             'manual_set_point': self._manual_set_point,
-            'external_temp': self._external_temp,
-            'room_temp': self._room_temp,
-            'current_temp': self._thermostat_current_temp,
-            'target_temp': self._thermostat_target_temp,
-            'loop_mode': self._thermostat_loop_mode
+            'external_temp': status.external_temp if status is not None else None,
+            'room_temp': status.room_temp if status is not None else None,
+            'current_temp': self.current_temperature,
+            'target_temp': self.target_temperature,
+            'loop_mode': self._thermostat_loop_mode,
+            'breaker_state': self.coordinator.breaker.state
         }
 
     async def async_added_to_hass(self) -> None:
         """Run when entity about to added."""
         await super().async_added_to_hass()
 
-        # Set thermostat time
-        self._hass.async_add_executor_job(self._thermostat.set_time)
-
         # Restore
         last_state = await self.async_get_last_state()
 
@@ -230,17 +231,43 @@ class FloureonClimate(ClimateEntity, RestoreEntity):
                 if param in last_state.attributes:
                     setattr(self, '_{0}'.format(param), last_state.attributes[param])
 
-    async def async_set_temperature(self, **kwargs) -> None:
+        if self.coordinator.data:
+            self.update_from_data(self.coordinator.status)
+        elif last_state is not None:
+            # Thermostat is not read until warm-up, come up with last known state
+            self.restore_from_state(last_state)
+
+    def restore_from_state(self, last_state) -> None:
+        """Restore thermostat info from last state"""
+        if last_state.state in [STATE_UNAVAILABLE, STATE_UNKNOWN]:
+            return
+
+        attributes = last_state.attributes
+
+        if last_state.state in self.hvac_modes:
+            self._thermostat_current_mode = HVACMode(last_state.state)
+        self._thermostat_current_action = attributes.get(ATTR_HVAC_ACTION)
+        self._preset_mode = attributes.get(ATTR_PRESET_MODE)
+
+        self.set_temp_limits(attributes.get(ATTR_MIN_TEMP, self._min_temp), attributes.get(ATTR_MAX_TEMP, self._max_temp))
+        self._restored_status = ThermostatStatus(
+            room_temp=attributes.get('room_temp'),
+            external_temp=attributes.get('external_temp'),
+            thermostat_temp=attributes.get('target_temp')
+        )
+
+    async def async_set_temperature(self, **kwargs) -> bool:
         """Set new target temperature."""
+        result = True
         if kwargs.get(ATTR_TEMPERATURE) is not None:
             target_temp = float(kwargs.get(ATTR_TEMPERATURE))
 
-            device = self._thermostat.device()
-            if device.auth():
-                # device.set_power(BROADLINK_POWER_ON)
-                device.set_mode(BROADLINK_MODE_MANUAL, self._thermostat_loop_mode, self.thermostat_get_sensor())
-                device.set_temp(target_temp)
-
+            result = await self.coordinator.async_execute(
+                # ('set_power', BROADLINK_POWER_ON),
+                ('set_mode', BROADLINK_MODE_MANUAL, self._thermostat_loop_mode, self.thermostat_get_sensor()),
+                ('set_temp', target_temp)
+            )
+            if result:
                 # Save temperatures for future use
                 if self._preset_mode == PRESET_AWAY:
                     self._away_set_point = target_temp
@@ -249,36 +276,60 @@ class FloureonClimate(ClimateEntity, RestoreEntity):
 
         self.async_write_ha_state()
 
-    async def async_set_hvac_mode(self, hvac_mode) -> None:
+        return result
+
+    async def async_set_hvac_mode(self, hvac_mode) -> bool:
         """Set operation mode."""
-        device = self._thermostat.device()
-        if device.auth():
-            if hvac_mode == HVACMode.OFF:
-                device.set_power(BROADLINK_POWER_OFF)
-            else:
-                device.set_power(BROADLINK_POWER_ON)
-                if hvac_mode == HVACMode.AUTO:
-                    device.set_mode(BROADLINK_MODE_AUTO, self._thermostat_loop_mode, self.thermostat_get_sensor())
-                elif hvac_mode == HVACMode.HEAT or hvac_mode == HVACMode.HEAT_COOL:
-                    device.set_mode(BROADLINK_MODE_MANUAL, self._thermostat_loop_mode, self.thermostat_get_sensor())
+        if hvac_mode == HVACMode.OFF:
+            result = await self.coordinator.async_execute(('set_power', BROADLINK_POWER_OFF))
+        elif hvac_mode == HVACMode.AUTO:
+            result = await self.coordinator.async_execute(
+                ('set_power', BROADLINK_POWER_ON),
+                ('set_mode', BROADLINK_MODE_AUTO, self._thermostat_loop_mode, self.thermostat_get_sensor())
+            )
+        elif hvac_mode == HVACMode.HEAT or hvac_mode == HVACMode.HEAT_COOL:
+            result = await self.coordinator.async_execute(
+                ('set_power', BROADLINK_POWER_ON),
+                ('set_mode', BROADLINK_MODE_MANUAL, self._thermostat_loop_mode, self.thermostat_get_sensor())
+            )
+        else:
+            result = await self.coordinator.async_execute(('set_power', BROADLINK_POWER_ON))
 
         self.async_write_ha_state()
 
-    async def async_set_preset_mode(self, preset_mode) -> None:
+        return result
+
+    async def async_set_preset_mode(self, preset_mode) -> bool:
         """Set new preset mode."""
         self._preset_mode = preset_mode
 
-        device = self._thermostat.device()
-        if device.auth():
-            device.set_power(BROADLINK_POWER_ON)
-            device.set_mode(BROADLINK_MODE_MANUAL, self._thermostat_loop_mode, self.thermostat_get_sensor())
-            if self._preset_mode == PRESET_AWAY:
-                device.set_temp(self._away_set_point)
-            elif self._preset_mode == PRESET_NONE:
-                device.set_temp(self._manual_set_point)
+        commands = [
+            ('set_power', BROADLINK_POWER_ON),
+            ('set_mode', BROADLINK_MODE_MANUAL, self._thermostat_loop_mode, self.thermostat_get_sensor())
+        ]
+        if self._preset_mode == PRESET_AWAY:
+            commands.append(('set_temp', self._away_set_point))
+        elif self._preset_mode == PRESET_NONE:
+            commands.append(('set_temp', self._manual_set_point))
+
+        result = await self.coordinator.async_execute(*commands)
 
         self.async_write_ha_state()
 
+        return result
+
+    async def async_bulk_apply(self, hvac_mode=None, temperature=None, preset_mode=None) -> bool:
+        """Apply bulk service call, commands of every entity of the host are merged into single write"""
+        calls = []
+        if hvac_mode is not None:
+            calls.append(self.async_set_hvac_mode(hvac_mode))
+        if preset_mode is not None:
+            calls.append(self.async_set_preset_mode(preset_mode))
+        if temperature is not None:
+            calls.append(self.async_set_temperature(**{ATTR_TEMPERATURE: temperature}))
+
+        return all(await asyncio.gather(*calls))
+
     async def async_turn_off(self) -> None:
         """Turn thermostat off"""
         await self.async_set_hvac_mode(HVACMode.OFF)
@@ -287,32 +338,22 @@ class FloureonClimate(ClimateEntity, RestoreEntity):
         """Turn thermostat on"""
         await self.async_set_hvac_mode(HVACMode.AUTO)
 
-    async def async_update(self) -> None:
+    def update_from_data(self, data) -> None:
         """Get thermostat info"""
-        data = await self._hass.async_add_executor_job(self._thermostat.read_status)
-
         if not data:
             return
 
         # Temperatures
-        self._room_temp = data['room_temp']
-        self._external_temp = data['external_temp']
-
-        self._hysteresis = int(data['dif'])
-        self._min_temp = int(data['svl'])
-        self._max_temp = int(data['svh'])
-
-        self._thermostat_target_temp = data['thermostat_temp']
-        self._thermostat_current_temp = data['external_temp'] if self._use_external_temp else data['room_temp']
+        self.set_temp_limits(int(data.svl), int(data.svh))
 
         # Thermostat modes & status
-        if data["power"] == BROADLINK_POWER_OFF:
+        if data.power == BROADLINK_POWER_OFF:
             # Unset away mode
             self._preset_mode = PRESET_NONE
             self._thermostat_current_mode = HVACMode.OFF
         else:
             # Set mode to manual when overridden auto mode or thermostat is in manual mode
-            if data["auto_mode"] == BROADLINK_MODE_MANUAL or data['temp_manual'] == BROADLINK_TEMP_MANUAL:
+            if data.auto_mode == BROADLINK_MODE_MANUAL or data.temp_manual == BROADLINK_TEMP_MANUAL:
                 if self._use_cooling is True:
                     self._thermostat_current_mode = HVACMode.HEAT_COOL
                 else:
@@ -323,17 +364,17 @@ class FloureonClimate(ClimateEntity, RestoreEntity):
                 self._thermostat_current_mode = HVACMode.AUTO
 
         # Thermostat action
-        if data["power"] == BROADLINK_POWER_ON and data["active"] == BROADLINK_ACTIVE:
+        if data.power == BROADLINK_POWER_ON and data.active == BROADLINK_ACTIVE:
             if self._use_cooling is True:
-                if self._thermostat_target_temp + self._hysteresis < self._thermostat_current_temp:
+                if data.thermostat_temp + int(data.dif) < self.current_temperature:
                     self._thermostat_current_action = HVACAction.COOLING
                 else:
                     self._thermostat_current_action = HVACAction.HEATING
             else:
                 self._thermostat_current_action = HVACAction.HEATING
-        elif data["power"] == BROADLINK_POWER_ON and data["active"] == BROADLINK_IDLE:
+        elif data.power == BROADLINK_POWER_ON and data.active == BROADLINK_IDLE:
             self._thermostat_current_action = HVACAction.IDLE
-        elif data["power"] == BROADLINK_POWER_OFF:
+        elif data.power == BROADLINK_POWER_OFF:
             self._thermostat_current_action = HVACAction.OFF
 
         _LOGGER.debug(
@@ -0,0 +1,142 @@
+import broadlink
+import logging
+
+import voluptuous as vol
+
+from custom_components.floureon import (
+    DOMAIN,
+    CONF_HOST,
+    CONF_MAC,
+    CONF_DEVTYPE,
+    CONF_KEY,
+    CONF_DEVICE_ID,
+    CONF_SCHEDULE,
+    CONF_USE_EXTERNAL_TEMP,
+    CONF_PRECISION,
+    CONF_USE_COOLING,
+    DEFAULT_SCHEDULE,
+    DEFAULT_USE_EXTERNAL_TEMP,
+    DEFAULT_PRECISION,
+    DEFAULT_USE_COOLING
+)
+
+from homeassistant import config_entries
+from homeassistant.const import (
+    PRECISION_HALVES,
+    PRECISION_WHOLE,
+    PRECISION_TENTHS
+)
+from homeassistant.core import callback
+
+_LOGGER = logging.getLogger(__name__)
+
+DISCOVERY_TIMEOUT = 5
+
+# Broadlink device type of hysen thermostats
+THERMOSTAT_TYPE = 'HYS'
+
+MANUAL_HOST = 'manual'
+
+
+class FloureonConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
+    VERSION = 1
+
+    def __init__(self):
+        self._devices = {}
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        return FloureonOptionsFlow()
+
+    async def async_step_user(self, user_input=None):
+        """Discover thermostats with single network scan"""
+        if user_input is not None:
+            if user_input[CONF_MAC] == MANUAL_HOST:
+                return await self.async_step_manual()
+
+            return await self.async_create_thermostat_entry(self._devices[user_input[CONF_MAC]])
+
+        try:
+            devices = await self.hass.async_add_executor_job(broadlink.discover, DISCOVERY_TIMEOUT)
+        except OSError as e:
+            _LOGGER.warning("Thermostat discovery error: %s", str(e))
+            devices = []
+
+        configured = self._async_current_ids()
+        self._devices = {
+            device.mac.hex(): device for device in devices
+            if device.type == THERMOSTAT_TYPE and device.mac.hex() not in configured
+        }
+
+        if not self._devices:
+            return await self.async_step_manual()
+
+        choices = {mac: '{0} ({1})'.format(device.name or device.host[0], device.host[0])
+                   for mac, device in self._devices.items()}
+        choices[MANUAL_HOST] = 'Enter host manually'
+
+        return self.async_show_form(
+            step_id='user',
+            data_schema=vol.Schema({vol.Required(CONF_MAC): vol.In(choices)})
+        )
+
+    async def async_step_manual(self, user_input=None):
+        """Connect thermostat by host"""
+        errors = {}
+        if user_input is not None:
+            try:
+                device = await self.hass.async_add_executor_job(broadlink.hello, user_input[CONF_HOST])
+            except (broadlink.exceptions.BroadlinkException, OSError):
+                errors['base'] = 'cannot_connect'
+            else:
+                if device.type == THERMOSTAT_TYPE:
+                    return await self.async_create_thermostat_entry(device)
+                errors['base'] = 'not_supported'
+
+        return self.async_show_form(
+            step_id='manual',
+            data_schema=vol.Schema({vol.Required(CONF_HOST): str}),
+            errors=errors
+        )
+
+    async def async_create_thermostat_entry(self, device):
+        """Authenticate thermostat and store its identity and session key"""
+        await self.async_set_unique_id(device.mac.hex())
+        self._abort_if_unique_id_configured(updates={CONF_HOST: device.host[0]})
+
+        try:
+            await self.hass.async_add_executor_job(device.auth)
+        except (broadlink.exceptions.BroadlinkException, OSError):
+            return self.async_abort(reason='cannot_connect')
+
+        return self.async_create_entry(
+            title=device.name or device.host[0],
+            data={
+                CONF_HOST: device.host[0],
+                CONF_MAC: device.mac.hex(),
+                CONF_DEVTYPE: device.devtype,
+                CONF_KEY: device.aes.algorithm.key.hex(),
+                CONF_DEVICE_ID: device.id
+            }
+        )
+
+
+class FloureonOptionsFlow(config_entries.OptionsFlow):
+
+    async def async_step_init(self, user_input=None):
+        """Climate options"""
+        if user_input is not None:
+            return self.async_create_entry(title='', data=user_input)
+
+        options = self.config_entry.options
+
+        return self.async_show_form(
+            step_id='init',
+            data_schema=vol.Schema({
+                vol.Optional(CONF_SCHEDULE, default=options.get(CONF_SCHEDULE, DEFAULT_SCHEDULE)): vol.In([0, 1, 2]),
+                vol.Optional(CONF_USE_EXTERNAL_TEMP, default=options.get(CONF_USE_EXTERNAL_TEMP, DEFAULT_USE_EXTERNAL_TEMP)): bool,
+                vol.Optional(CONF_PRECISION, default=options.get(CONF_PRECISION, DEFAULT_PRECISION)): vol.In([PRECISION_HALVES, PRECISION_WHOLE, PRECISION_TENTHS]),
+                vol.Optional(CONF_USE_COOLING, default=options.get(CONF_USE_COOLING, DEFAULT_USE_COOLING)): bool
+            })
+        )
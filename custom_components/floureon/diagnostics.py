@@ -0,0 +1,26 @@
+from custom_components.floureon import (
+    CONF_KEY,
+    DATA_COORDINATORS,
+    DOMAIN
+)
+
+from homeassistant.components.diagnostics import async_redact_data
+
+TO_REDACT = [CONF_KEY]
+
+
+async def async_get_config_entry_diagnostics(hass, entry) -> dict:
+    """Return thermostat metrics, health and last status"""
+    coordinator = hass.data[DOMAIN][DATA_COORDINATORS][entry.unique_id]
+
+    return {
+        'entry': async_redact_data(entry.as_dict(), TO_REDACT),
+        'breaker': {
+            'state': coordinator.breaker.state,
+            'failures': coordinator.breaker.failures
+        },
+        'poll_interval': coordinator.update_interval.total_seconds(),
+        'transport': 'asyncio' if coordinator.client is not None else 'broadlink',
+        'stats': coordinator.stats,
+        'data': coordinator.data.as_dict() if coordinator.data is not None else None
+    }
@@ -0,0 +1,178 @@
+"""Fixed size status history of a thermostat, optionally kept in memory mapped file"""
+import logging
+import mmap
+import os
+import struct
+
+_LOGGER = logging.getLogger(__name__)
+
+MAGIC = b'FLH1'
+
+# Magic, capacity, next write position, number of records
+HEADER = struct.Struct('<4sIII')
+
+# Unix time, room, external and target temperatures in half degrees, active flag
+RECORD = struct.Struct('<dBBBB')
+
+
+class StatusHistory:
+    """Ring buffer of timestamped temperatures and heating state.
+    Duty cycle and temperature trends over the window are updated incrementally on every append.
+    """
+
+    def __init__(self, capacity, window):
+        self.capacity = capacity
+        self.window = window
+        self.head = 0
+        self.count = 0
+        self._buffer = bytearray(HEADER.size + capacity * RECORD.size)
+        self._mmap = None
+        self._reset_window()
+
+    def _reset_window(self) -> None:
+        # Window holds the newest records, starting at physical position _start
+        self._start = self.head
+        self._size = 0
+        self._base = None
+        self._active_time = 0.0
+        self._span = 0.0
+        self._n = 0
+        self._st = 0.0
+        self._stt = 0.0
+        self._sy = [0.0, 0.0]
+        self._sty = [0.0, 0.0]
+
+    def _record(self, position) -> tuple:
+        return RECORD.unpack_from(self._buffer, HEADER.size + position * RECORD.size)
+
+    def _add(self, record, previous) -> None:
+        """Add newest record to window sums"""
+        timestamp, room, external, target, active = record
+        if self._base is None:
+            self._base = timestamp
+
+        t = timestamp - self._base
+        self._n += 1
+        self._st += t
+        self._stt += t * t
+        for i, y in enumerate((room / 2.0, external / 2.0)):
+            self._sy[i] += y
+            self._sty[i] += t * y
+
+        if previous is not None:
+            interval = timestamp - previous[0]
+            self._span += interval
+            self._active_time += interval * previous[4]
+
+    def _remove_oldest(self) -> None:
+        """Remove oldest record from window sums"""
+        record = self._record(self._start)
+        timestamp, room, external, target, active = record
+
+        t = timestamp - self._base
+        self._n -= 1
+        self._st -= t
+        self._stt -= t * t
+        for i, y in enumerate((room / 2.0, external / 2.0)):
+            self._sy[i] -= y
+            self._sty[i] -= t * y
+
+        self._start = (self._start + 1) % self.capacity
+        self._size -= 1
+        if self._size:
+            interval = self._record(self._start)[0] - timestamp
+            self._span -= interval
+            self._active_time -= interval * active
+        else:
+            self._reset_window()
+
+    def append(self, timestamp, room_temp, external_temp, target_temp, active) -> None:
+        """Store status, overwriting the oldest record when full"""
+        if self.count == self.capacity and self._size == self.count:
+            self._remove_oldest()
+
+        previous = self._record((self.head - 1) % self.capacity) if self._size else None
+        record = (timestamp, int(room_temp * 2), int(external_temp * 2), int(target_temp * 2), int(active))
+        RECORD.pack_into(self._buffer, HEADER.size + self.head * RECORD.size, *record)
+
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        HEADER.pack_into(self._buffer, 0, MAGIC, self.capacity, self.head, self.count)
+
+        self._size += 1
+        self._add(record, previous)
+        while self._size > 1 and timestamp - self._record(self._start)[0] > self.window:
+            self._remove_oldest()
+
+    def records(self) -> list:
+        """Return stored records, oldest first"""
+        return [self._record((self.head - self.count + i) % self.capacity) for i in range(self.count)]
+
+    @property
+    def duty_cycle(self):
+        """Return percentage of window time thermostat was heating"""
+        return round(self._active_time / self._span * 100, 1) if self._span > 0 else None
+
+    def rate(self, series):
+        """Return temperature change per hour over window, least squares slope"""
+        denominator = self._n * self._stt - self._st * self._st
+        if self._n < 2 or denominator <= 0:
+            return None
+
+        return round((self._n * self._sty[series] - self._st * self._sy[series]) / denominator * 3600, 2)
+
+    @property
+    def room_temp_rate(self):
+        return self.rate(0)
+
+    @property
+    def external_temp_rate(self):
+        return self.rate(1)
+
+    def open(self, path, now) -> None:
+        """Map history to file, restoring records kept there. Records in memory are replaced."""
+        size = len(self._buffer)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if os.fstat(fd).st_size != size:
+                os.ftruncate(fd, 0)
+                os.ftruncate(fd, size)
+            self._mmap = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+
+        magic, capacity, head, count = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or capacity != self.capacity or head >= capacity or count > capacity:
+            head, count = 0, 0
+            self._mmap[:] = bytes(size)
+
+        self._buffer = self._mmap
+        self.head, self.count = head, count
+        self._reset_window()
+
+        # Rebuild window sums from records newer than window
+        first = self.count
+        while first > 0 and now - self._record((self.head - first) % self.capacity)[0] > self.window:
+            first -= 1
+
+        previous = None
+        for i in range(self.count - first, self.count):
+            position = (self.head - self.count + i) % self.capacity
+            if self._size == 0:
+                self._start = position
+            record = self._record(position)
+            self._size += 1
+            self._add(record, previous)
+            previous = record
+
+        _LOGGER.debug("Restored %s history records from %s", self.count, path)
+
+    def close(self) -> None:
+        """Flush and unmap file, history is kept in memory afterwards"""
+        if self._mmap is None:
+            return
+
+        self._mmap.flush()
+        self._buffer = bytearray(self._mmap)
+        self._mmap.close()
+        self._mmap = None
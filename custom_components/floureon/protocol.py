@@ -0,0 +1,409 @@
+"""Native asyncio client for Broadlink hysen (Floureon / Beok) thermostats"""
+import asyncio
+import logging
+import random
+import socket
+
+try:
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+    SUPPORTED = True
+except ImportError:
+    SUPPORTED = False
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_PORT = 80
+DEFAULT_TIMEOUT = 3
+RETRY_INTERVAL = 1
+
+INIT_KEY = bytes.fromhex('097628343fe99e23765c1513accf8b02')
+INIT_VECT = bytes.fromhex('562e17996d093d28ddb3ba695a2e6f58')
+
+PACKET_HELLO = 0x06
+PACKET_AUTH = 0x65
+PACKET_COMMAND = 0x6A
+
+# Authentication failed, control key expired, device control ID error
+AUTH_ERRORS = [-1, -7, -4012]
+
+REQUEST_STATUS = [0x01, 0x03, 0x00, 0x00, 0x00, 0x08]
+REQUEST_FULL_STATUS = [0x01, 0x03, 0x00, 0x00, 0x00, 0x16]
+
+
+class ThermostatError(Exception):
+    """Error code reported by thermostat"""
+
+
+class ThermostatDataError(ThermostatError):
+    """Malformed packet received from thermostat"""
+
+
+class ThermostatAuthError(ThermostatError):
+    """Authentication failed or session key expired"""
+
+
+def checksum(data) -> int:
+    """Broadlink packet checksum"""
+    return sum(data, 0xBEAF) & 0xFFFF
+
+
+def crc16(data) -> int:
+    """Modbus CRC-16 of hysen request / response"""
+    crc = 0xFFFF
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+    return crc
+
+
+def decode_status(payload) -> dict:
+    """Decode hysen status registers, same layout as broadlink get_full_status().
+    Time and schedule are decoded only when full status registers are read.
+    """
+    data = {
+        'remote_lock': payload[3] & 1,
+        'power': payload[4] & 1,
+        'active': (payload[4] >> 4) & 1,
+        'temp_manual': (payload[4] >> 6) & 1,
+        'room_temp': payload[5] / 2.0,
+        'thermostat_temp': payload[6] / 2.0,
+        'auto_mode': payload[7] & 0xF,
+        'loop_mode': payload[7] >> 4,
+        'sensor': payload[8],
+        'osv': payload[9],
+        'dif': payload[10],
+        'svh': payload[11],
+        'svl': payload[12],
+        'room_temp_adj': int.from_bytes(payload[13:15], 'big', signed=True) / 10.0,
+        'fre': payload[15],
+        'poweron': payload[16],
+        'unknown': payload[17],
+        'external_temp': payload[18] / 2.0
+    }
+
+    if len(payload) < 47:
+        return data
+
+    data.update({
+        'hour': payload[19],
+        'min': payload[20],
+        'sec': payload[21],
+        'dayofweek': payload[22]
+    })
+
+    schedule = [{
+        'start_hour': payload[2 * i + 23],
+        'start_minute': payload[2 * i + 24],
+        'temp': payload[i + 39] / 2.0
+    } for i in range(0, 8)]
+
+    data['weekday'] = schedule[:6]
+    data['weekend'] = schedule[6:]
+
+    return data
+
+
+class ThermostatProtocol(asyncio.DatagramProtocol):
+    """Datagram protocol delivering thermostat responses to the waiting request"""
+
+    def __init__(self):
+        self.transport = None
+        self.response = None
+        self.count = None
+
+    def connection_made(self, transport) -> None:
+        self.transport = transport
+
+    def connection_lost(self, exc) -> None:
+        self.transport = None
+        if self.response is not None and not self.response.done():
+            self.response.set_exception(exc or ConnectionError('Connection closed'))
+
+    def accepts(self, data) -> bool:
+        """Check if data answers the waiting request, late responses of previous requests are dropped"""
+        if self.response is None or self.response.done():
+            return False
+
+        return self.count is None or data[0x28:0x2A] == self.count.to_bytes(2, 'little')
+
+    def datagram_received(self, data, addr) -> None:
+        if self.accepts(data):
+            self.response.set_result(data)
+
+    def error_received(self, exc) -> None:
+        _LOGGER.debug("Thermostat protocol error: %s", str(exc))
+
+
+class FleetEndpoint(ThermostatProtocol):
+    """Thermostat endpoint on the shared fleet socket, it is its own transport"""
+
+    def __init__(self, fleet, addr):
+        super().__init__()
+        self.fleet = fleet
+        self.addr = addr
+        self.transport = self
+
+    def sendto(self, data) -> None:
+        if self.fleet.transport is None:
+            raise ConnectionError('Fleet socket is closed')
+        self.fleet.transport.sendto(data, self.addr)
+
+    def close(self) -> None:
+        self.fleet.release(self)
+        self.transport = None
+
+
+class FleetTransport(asyncio.DatagramProtocol):
+    """Single datagram socket shared by every thermostat.
+    Responses are routed by source address, then by packet count to one of the endpoints of that address,
+    as clients of YAML and config entry thermostats may talk to the same device.
+    """
+
+    def __init__(self):
+        self.transport = None
+        self._endpoints = {}
+        self._lock = asyncio.Lock()
+
+    async def endpoint(self, host, port) -> FleetEndpoint:
+        """Return endpoint of thermostat, opening shared socket on first use"""
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            if self.transport is None:
+                await loop.create_datagram_endpoint(lambda: self, local_addr=('0.0.0.0', 0))
+
+        info = await loop.getaddrinfo(host, port, family=socket.AF_INET, type=socket.SOCK_DGRAM)
+        endpoint = FleetEndpoint(self, info[0][4])
+        endpoints = self._endpoints.setdefault(endpoint.addr, [])
+        endpoints.append(endpoint)
+        if len(endpoints) > 1:
+            _LOGGER.debug("Thermostat %s:%s is shared by %s clients", host, port, len(endpoints))
+
+        return endpoint
+
+    def release(self, endpoint) -> None:
+        endpoints = self._endpoints.get(endpoint.addr, [])
+        if endpoint in endpoints:
+            endpoints.remove(endpoint)
+        if not endpoints:
+            self._endpoints.pop(endpoint.addr, None)
+
+    def close(self) -> None:
+        """Close shared socket"""
+        if self.transport is not None:
+            self.transport.close()
+
+    def connection_made(self, transport) -> None:
+        self.transport = transport
+
+    def connection_lost(self, exc) -> None:
+        self.transport = None
+        for endpoints in list(self._endpoints.values()):
+            for endpoint in endpoints:
+                endpoint.connection_lost(exc)
+        self._endpoints.clear()
+
+    def datagram_received(self, data, addr) -> None:
+        # Endpoints waiting for a counted response first, hello requests are not counted
+        for endpoint in sorted(self._endpoints.get(addr[:2], []), key=lambda endpoint: endpoint.count is None):
+            if endpoint.accepts(data):
+                endpoint.datagram_received(data, addr)
+                return
+
+    def error_received(self, exc) -> None:
+        _LOGGER.debug("Thermostat fleet socket error: %s", str(exc))
+
+
+class AsyncThermostat:
+    """Thermostat session over a long-lived datagram endpoint"""
+
+    def __init__(self, host, mac=None, devtype=None, key=None, device_id=0, port=DEFAULT_PORT, timeout=DEFAULT_TIMEOUT,
+                 fleet=None):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.fleet = fleet
+        self.mac = mac
+        self.devtype = devtype
+        self.id = 0
+        self.count = random.randint(0x8000, 0xFFFF)
+        self.cache_hits = 0
+        self.reauths = 0
+        self.retries = 0
+        self._authenticated = False
+        self._aes = None
+        self._protocol = None
+        self._lock = asyncio.Lock()
+        self.update_aes(INIT_KEY)
+
+        # Known identity and session key, skip discovery and authentication
+        if mac is not None and key is not None:
+            self.id = device_id
+            self.update_aes(key)
+            self._authenticated = True
+
+    def update_aes(self, key) -> None:
+        self._aes = Cipher(algorithms.AES(bytes(key)), modes.CBC(INIT_VECT))
+
+    def encrypt(self, payload) -> bytes:
+        encryptor = self._aes.encryptor()
+        return encryptor.update(bytes(payload)) + encryptor.finalize()
+
+    def decrypt(self, payload) -> bytes:
+        decryptor = self._aes.decryptor()
+        return decryptor.update(bytes(payload)) + decryptor.finalize()
+
+    def close(self) -> None:
+        """Close datagram endpoint"""
+        if self._protocol is not None and self._protocol.transport is not None:
+            self._protocol.transport.close()
+        self._protocol = None
+        self._authenticated = False
+
+    async def _send(self, packet, count=None) -> bytes:
+        """Send packet, resending every RETRY_INTERVAL until response or timeout"""
+        if self._protocol is None or self._protocol.transport is None:
+            if self.fleet is not None:
+                self._protocol = await self.fleet.endpoint(self.host, self.port)
+            else:
+                _, self._protocol = await asyncio.get_running_loop().create_datagram_endpoint(
+                    ThermostatProtocol, remote_addr=(self.host, self.port)
+                )
+
+        protocol = self._protocol
+        protocol.count = count
+        protocol.response = asyncio.get_running_loop().create_future()
+        try:
+            async with asyncio.timeout(self.timeout):
+                while True:
+                    protocol.transport.sendto(packet)
+                    try:
+                        return await asyncio.wait_for(asyncio.shield(protocol.response), RETRY_INTERVAL)
+                    except asyncio.TimeoutError:
+                        self.retries += 1
+        finally:
+            protocol.response = None
+
+    async def hello(self) -> None:
+        """Discover thermostat MAC and device type"""
+        packet = bytearray(0x30)
+        packet[0x26] = PACKET_HELLO
+        packet[0x20:0x22] = checksum(packet).to_bytes(2, 'little')
+
+        response = await self._send(packet)
+        if len(response) < 0x40:
+            raise ThermostatDataError('Hello response is too short')
+
+        self.devtype = response[0x34] | response[0x35] << 8
+        self.mac = response[0x3A:0x40][::-1]
+
+    async def send_packet(self, packet_type, payload) -> bytes:
+        """Send encrypted packet, return decrypted response payload"""
+        self.count = ((self.count + 1) | 0x8000) & 0xFFFF
+        packet = bytearray(0x38)
+        packet[0x00:0x08] = bytes.fromhex('5aa5aa555aa5aa55')
+        packet[0x24:0x26] = self.devtype.to_bytes(2, 'little')
+        packet[0x26:0x28] = packet_type.to_bytes(2, 'little')
+        packet[0x28:0x2A] = self.count.to_bytes(2, 'little')
+        packet[0x2A:0x30] = self.mac[::-1]
+        packet[0x30:0x34] = self.id.to_bytes(4, 'little')
+        packet[0x34:0x36] = checksum(payload).to_bytes(2, 'little')
+        packet.extend(self.encrypt(bytes(payload) + bytes((16 - len(payload)) % 16)))
+        packet[0x20:0x22] = checksum(packet).to_bytes(2, 'little')
+
+        response = await self._send(packet, self.count)
+        if len(response) < 0x38:
+            raise ThermostatDataError('Response is too short')
+
+        if int.from_bytes(response[0x20:0x22], 'little') != (checksum(response) - sum(response[0x20:0x22])) & 0xFFFF:
+            raise ThermostatDataError('Response checksum error')
+
+        error = int.from_bytes(response[0x22:0x24], 'little', signed=True)
+        if error in AUTH_ERRORS:
+            raise ThermostatAuthError('Thermostat authentication error code {0}'.format(error))
+        if error:
+            raise ThermostatError('Thermostat error code {0}'.format(error))
+
+        return self.decrypt(response[0x38:])
+
+    async def auth(self) -> None:
+        """Authenticate and update session key"""
+        self.id = 0
+        self.update_aes(INIT_KEY)
+
+        packet = bytearray(0x50)
+        packet[0x04:0x14] = [0x31] * 16
+        packet[0x1E] = 0x01
+        packet[0x2D] = 0x01
+        packet[0x30:0x36] = 'Test 1'.encode()
+
+        payload = await self.send_packet(PACKET_AUTH, packet)
+        self.id = int.from_bytes(payload[:0x04], 'little')
+        self.update_aes(payload[0x04:0x14])
+
+    async def send_request(self, request) -> bytes:
+        """Send hysen request, return validated response"""
+        packet = bytearray((len(request) + 2).to_bytes(2, 'little'))
+        packet.extend(request)
+        packet.extend(crc16(request).to_bytes(2, 'little'))
+
+        payload = await self.send_packet(PACKET_COMMAND, packet)
+        length = int.from_bytes(payload[:0x02], 'little')
+        if length + 2 > len(payload):
+            raise ThermostatDataError('Response length error')
+
+        if int.from_bytes(payload[length:length + 2], 'little') != crc16(payload[0x02:length]):
+            raise ThermostatDataError('Response CRC error')
+
+        return payload[0x02:length]
+
+    async def get_status(self) -> dict:
+        return decode_status(await self.send_request(REQUEST_STATUS))
+
+    async def get_full_status(self) -> dict:
+        return decode_status(await self.send_request(REQUEST_FULL_STATUS))
+
+    async def set_mode(self, auto_mode, loop_mode, sensor=0) -> None:
+        await self.send_request([0x01, 0x06, 0x00, 0x02, ((loop_mode + 1) << 4) + auto_mode, sensor])
+
+    async def set_temp(self, temp) -> None:
+        await self.send_request([0x01, 0x06, 0x00, 0x01, 0x00, int(temp * 2)])
+
+    async def set_power(self, power=1, remote_lock=0) -> None:
+        await self.send_request([0x01, 0x06, 0x00, 0x00, remote_lock, power])
+
+    async def set_time(self, hour, minute, second, day) -> None:
+        await self.send_request([0x01, 0x10, 0x00, 0x08, 0x00, 0x02, 0x04, hour, minute, second, day])
+
+    async def set_schedule(self, weekday, weekend) -> None:
+        """Set 6 weekday and 2 weekend periods, same arguments as broadlink hysen set_schedule()"""
+        periods = list(weekday[:6]) + list(weekend[:2])
+        request = [0x01, 0x10, 0x00, 0x0A, 0x00, 0x0C, 0x18]
+        for period in periods:
+            request.extend([period['start_hour'], period['start_minute']])
+        request.extend(int(period['temp'] * 2) for period in periods)
+        await self.send_request(request)
+
+    async def execute(self, *commands) -> list:
+        """Execute commands, ex. ('set_temp', 20.5), re-authenticating once on error or timeout"""
+        async with self._lock:
+            while True:
+                reauth = not self._authenticated
+                if reauth:
+                    if self.mac is None:
+                        await self.hello()
+                    await self.auth()
+                    self._authenticated = True
+                    self.reauths += 1
+                    _LOGGER.debug("Thermostat %s authenticated, re-auth count: %s", self.host, self.reauths)
+                else:
+                    self.cache_hits += 1
+
+                try:
+                    return [await getattr(self, command)(*args) for command, *args in commands]
+                except ThermostatDataError:
+                    raise
+                except (ThermostatError, asyncio.TimeoutError):
+                    self._authenticated = False
+                    if reauth:
+                        raise
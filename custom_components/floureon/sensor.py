@@ -0,0 +1,107 @@
+import logging
+
+from custom_components.floureon import (
+    CONF_HOST,
+    DATA_COORDINATORS,
+    DOMAIN,
+    FloureonEntity
+)
+
+from homeassistant.components.sensor import SensorEntity, SensorStateClass
+from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfTime
+
+_LOGGER = logging.getLogger(__name__)
+
+# Key: (name, unit, state class, value)
+DIAGNOSTIC_SENSORS = {
+    'call_latency': ('call latency', UnitOfTime.MILLISECONDS, SensorStateClass.MEASUREMENT,
+                     lambda coordinator: coordinator.metrics.latency_mean),
+    'retries': ('retries', None, SensorStateClass.TOTAL_INCREASING,
+                lambda coordinator: coordinator.retries),
+    'timeouts': ('timeouts', None, SensorStateClass.TOTAL_INCREASING,
+                 lambda coordinator: coordinator.metrics.timeouts),
+    'auth_failures': ('authentication failures', None, SensorStateClass.TOTAL_INCREASING,
+                      lambda coordinator: coordinator.metrics.auth_failures),
+    'errors': ('errors', None, SensorStateClass.TOTAL_INCREASING,
+               lambda coordinator: coordinator.metrics.errors),
+    'suppressed_writes': ('suppressed state writes', None, SensorStateClass.TOTAL_INCREASING,
+                          lambda coordinator: coordinator.suppressed_writes)
+}
+
+# Key: (name, unit, value), computed from status history window
+HISTORY_SENSORS = {
+    'duty_cycle': ('heating duty cycle', PERCENTAGE, lambda history: history.duty_cycle),
+    'room_temp_rate': ('room temperature rate', '°C/h', lambda history: history.room_temp_rate),
+    'external_temp_rate': ('external temperature rate', '°C/h', lambda history: history.external_temp_rate)
+}
+
+
+async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
+    """Set up thermostat diagnostic sensors."""
+    if discovery_info is None:
+        return
+
+    coordinator = hass.data[DOMAIN][DATA_COORDINATORS][discovery_info[CONF_HOST]]
+    async_add_entities(
+        [FloureonDiagnosticSensor(coordinator, key) for key in DIAGNOSTIC_SENSORS] +
+        [FloureonHistorySensor(coordinator, key) for key in HISTORY_SENSORS]
+    )
+
+
+async def async_setup_entry(hass, entry, async_add_entities):
+    """Set up thermostat diagnostic sensors from config entry."""
+    coordinator = hass.data[DOMAIN][DATA_COORDINATORS][entry.unique_id]
+    async_add_entities(
+        [FloureonDiagnosticSensor(coordinator, key) for key in DIAGNOSTIC_SENSORS] +
+        [FloureonHistorySensor(coordinator, key) for key in HISTORY_SENSORS]
+    )
+
+
+class FloureonDiagnosticSensor(FloureonEntity, SensorEntity):
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, coordinator, key):
+        super().__init__(coordinator)
+        name, unit, state_class, self._value = DIAGNOSTIC_SENSORS[key]
+
+        self._key = key
+        self._attr_name = 'Floureon {0} {1}'.format(coordinator.host, name)
+        self._attr_unique_id = '{0}_{1}'.format(coordinator.unique_id, key)
+        self._attr_native_unit_of_measurement = unit
+        self._attr_state_class = state_class
+
+    @property
+    def available(self) -> bool:
+        """Diagnostics are available while thermostat is unreachable"""
+        return True
+
+    @property
+    def native_value(self):
+        """Return metric value"""
+        return self._value(self.coordinator)
+
+    @property
+    def extra_state_attributes(self):
+        """Return latency histogram"""
+        if self._key == 'call_latency':
+            return self.coordinator.metrics.histogram
+
+        return None
+
+
+class FloureonHistorySensor(FloureonEntity, SensorEntity):
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, coordinator, key):
+        super().__init__(coordinator)
+        name, unit, self._value = HISTORY_SENSORS[key]
+
+        self._attr_name = 'Floureon {0} {1}'.format(coordinator.host, name)
+        self._attr_unique_id = '{0}_{1}'.format(coordinator.unique_id, key)
+        self._attr_native_unit_of_measurement = unit
+
+    @property
+    def native_value(self):
+        """Return value over history window"""
+        return self._value(self.coordinator.history)
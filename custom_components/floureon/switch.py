@@ -1,12 +1,20 @@
 from socket import timeout
 from custom_components.floureon import (
-    BroadlinkThermostat,
+    async_get_coordinator,
+    FloureonEntity,
+    ThermostatStatus,
     CONF_HOST,
+    CONF_PORT,
     CONF_UNIQUE_ID,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_MAX_SCAN_INTERVAL,
     CONF_USE_EXTERNAL_TEMP,
     CONF_USE_EXTERNAL_TEMP,
     DEFAULT_SCHEDULE,
     DEFAULT_USE_EXTERNAL_TEMP,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_PORT,
+    DEFAULT_MAX_SCAN_INTERVAL,
     BROADLINK_POWER_ON,
     BROADLINK_POWER_OFF,
     BROADLINK_MODE_MANUAL,
@@ -30,7 +38,8 @@ from homeassistant.const import (
 )
 from homeassistant.components.climate.const import (
     DEFAULT_MIN_TEMP,
-    DEFAULT_MAX_TEMP
+    DEFAULT_MAX_TEMP,
+    HVACMode
 )
 
 import homeassistant.helpers.config_validation as cv
@@ -49,8 +58,11 @@ CONF_TURN_ON_MODE = 'turn_on_mode'
 
 PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend({
     vol.Required(CONF_HOST): cv.string,
+    vol.Optional(CONF_PORT, default=DEFAULT_PORT): cv.port,
     vol.Required(CONF_NAME): cv.string,
     vol.Optional(CONF_UNIQUE_ID): cv.string,
+    vol.Optional(CONF_MIN_SCAN_INTERVAL, default=DEFAULT_MIN_SCAN_INTERVAL): cv.positive_time_period,
+    vol.Optional(CONF_MAX_SCAN_INTERVAL, default=DEFAULT_MAX_SCAN_INTERVAL): cv.positive_time_period,
     vol.Optional(CONF_USE_EXTERNAL_TEMP, default=DEFAULT_USE_EXTERNAL_TEMP): cv.boolean,
     vol.Optional(CONF_TURN_OFF_MODE, default=DEFAULT_TURN_OFF_MODE): vol.Any(int, float, BROADLINK_MIN_TEMP, BROADLINK_TURN_OFF),
     vol.Optional(CONF_TURN_ON_MODE, default=DEFAULT_TURN_ON_MODE): vol.Any(int, float, BROADLINK_MAX_TEMP)
@@ -59,23 +71,18 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend({
 
 async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
     """Set up the platform."""
-    async_add_entities([FloureonSwitch(hass, config)])
+    coordinator = async_get_coordinator(hass, config)
+    async_add_entities([FloureonSwitch(hass, config, coordinator)])
 
 
-class FloureonSwitch(SwitchEntity, RestoreEntity):
+class FloureonSwitch(FloureonEntity, SwitchEntity, RestoreEntity):
 
-    def __init__(self, hass, config):
-        self._hass = hass
-        self._thermostat = BroadlinkThermostat(config.get(CONF_HOST))
+    def __init__(self, hass, config, coordinator):
+        super().__init__(coordinator)
 
         self._name = config.get(CONF_NAME)
         self._use_external_temp = config.get(CONF_USE_EXTERNAL_TEMP)
 
-        self._min_temp = DEFAULT_MIN_TEMP
-        self._max_temp = DEFAULT_MAX_TEMP
-        self._room_temp = None
-        self._external_temp = None
-
         self._turn_on_mode = config.get(CONF_TURN_ON_MODE)
         self._turn_off_mode = config.get(CONF_TURN_OFF_MODE)
 
@@ -83,9 +90,6 @@ class FloureonSwitch(SwitchEntity, RestoreEntity):
             _LOGGER.error("Turn off mode is greater than turn on mode, defaulting to \"min_temp\"")
             self._turn_off_mode = BROADLINK_MIN_TEMP
 
-        self._thermostat_current_temp = None
-        self._thermostat_target_temp = None
-
         self._attr_name = self._name
         self._attr_unique_id = config.get(CONF_UNIQUE_ID)
 
@@ -105,66 +109,109 @@ class FloureonSwitch(SwitchEntity, RestoreEntity):
         """Return thermostat state on / off"""
         return self._state == STATE_ON
 
+    @property
+    def min_temp(self) -> int:
+        """Return thermostat minimum temperature"""
+        status = self.status
+        return int(status.svl) if status is not None and status.svl is not None else DEFAULT_MIN_TEMP
+
+    @property
+    def max_temp(self) -> int:
+        """Return thermostat maximum temperature"""
+        status = self.status
+        return int(status.svh) if status is not None and status.svh is not None else DEFAULT_MAX_TEMP
+
     @property
     def extra_state_attributes(self) -> dict:
         """Return the attribute(s) of the sensor"""
+        status = self.status
+        if status is None:
+            status = ThermostatStatus()
+
         return {
-            'external_temp': self._external_temp,
-            'room_temp': self._room_temp,
-            'current_temp': self._thermostat_current_temp,
-            'target_temp': self._thermostat_target_temp
+            'external_temp': status.external_temp,
+            'room_temp': status.room_temp,
+            'current_temp': status.external_temp if self._use_external_temp else status.room_temp,
+            'target_temp': status.thermostat_temp,
+            'min_temp': self.min_temp,
+            'max_temp': self.max_temp,
+            'breaker_state': self.coordinator.breaker.state
         }
 
     async def async_added_to_hass(self) -> None:
         """Run when entity about to added."""
         await super().async_added_to_hass()
 
-        # Set thermostat time
-        self._hass.async_add_executor_job(self._thermostat.set_time)
+        last_state = await self.async_get_last_state()
+
+        if self.coordinator.data or last_state is None:
+            self.update_from_data(self.coordinator.status)
+        else:
+            # Thermostat is not read until warm-up, come up with last known state
+            self.restore_from_state(last_state)
+
+    def restore_from_state(self, last_state) -> None:
+        """Restore thermostat info from last state"""
+        if last_state.state not in [STATE_ON, STATE_OFF]:
+            return
+
+        attributes = last_state.attributes
 
-    async def async_turn_on(self, **kwargs) -> None:
+        self._state = last_state.state
+        self._restored_status = ThermostatStatus(
+            room_temp=attributes.get('room_temp'),
+            external_temp=attributes.get('external_temp'),
+            thermostat_temp=attributes.get('target_temp'),
+            svl=attributes.get('min_temp'),
+            svh=attributes.get('max_temp')
+        )
+
+    async def async_turn_on(self, **kwargs) -> bool:
         """Turn  the entity on"""
-        device = self._thermostat.device()
-        if device.auth():
-            device.set_power(BROADLINK_POWER_ON)
-            device.set_mode(BROADLINK_MODE_MANUAL, 0, self.thermostat_get_sensor())
-            device.set_temp(self._max_temp if self._turn_on_mode == BROADLINK_MAX_TEMP else float(self._turn_on_mode))
+        result = await self.coordinator.async_execute(
+            ('set_power', BROADLINK_POWER_ON),
+            ('set_mode', BROADLINK_MODE_MANUAL, 0, self.thermostat_get_sensor()),
+            ('set_temp', self.max_temp if self._turn_on_mode == BROADLINK_MAX_TEMP else float(self._turn_on_mode))
+        )
 
         self._state = STATE_ON
-        await self.async_update_ha_state()
+        self.async_write_ha_state()
+
+        return result
 
-    async def async_turn_off(self, **kwargs) -> None:
+    async def async_turn_off(self, **kwargs) -> bool:
         """Turn the entity off"""
-        device = self._thermostat.device()
-        if device.auth():
-            if self._turn_off_mode == BROADLINK_TURN_OFF:
-                device.set_power(BROADLINK_POWER_OFF)
-            else:
-                device.set_mode(BROADLINK_MODE_MANUAL, 0, self.thermostat_get_sensor())
-                device.set_temp(self._min_temp if self._turn_off_mode == BROADLINK_MIN_TEMP else float(self._turn_off_mode))
+        if self._turn_off_mode == BROADLINK_TURN_OFF:
+            result = await self.coordinator.async_execute(('set_power', BROADLINK_POWER_OFF))
+        else:
+            result = await self.coordinator.async_execute(
+                ('set_mode', BROADLINK_MODE_MANUAL, 0, self.thermostat_get_sensor()),
+                ('set_temp', self.min_temp if self._turn_off_mode == BROADLINK_MIN_TEMP else float(self._turn_off_mode))
+            )
 
         self._state = STATE_OFF
-        await self.async_update_ha_state()
+        self.async_write_ha_state()
 
-    async def async_update(self) -> None:
-        """Get thermostat info"""
-        data = await self._hass.async_add_executor_job(self._thermostat.read_status)
+        return result
+
+    async def async_bulk_apply(self, hvac_mode=None, temperature=None, preset_mode=None) -> bool:
+        """Apply bulk service call, switch follows hvac mode only"""
+        if hvac_mode is None:
+            return True
+
+        if hvac_mode == HVACMode.OFF:
+            return await self.async_turn_off()
 
+        return await self.async_turn_on()
+
+    def update_from_data(self, data) -> None:
+        """Get thermostat info"""
         if not data:
             self._state = STATE_UNAVAILABLE
             return
 
-        if data['power'] == BROADLINK_POWER_ON and data['active'] == BROADLINK_ACTIVE:
+        if data.power == BROADLINK_POWER_ON and data.active == BROADLINK_ACTIVE:
             self._state = STATE_ON
         else:
             self._state = STATE_OFF
 
-        self._room_temp = data['room_temp']
-        self._external_temp = data['external_temp']
-
-        self._thermostat_current_temp = data['external_temp'] if self._use_external_temp else data['room_temp']
-        self._thermostat_target_temp = data['thermostat_temp']
-
-        self._min_temp = int(data['svl'])
-        self._max_temp = int(data['svh'])
-
@@ -0,0 +1,11 @@
+"""Fixtures of floureon tests"""
+import pytest
+
+from tests.simulator import SimulatedFleet
+
+
+@pytest.fixture
+def fleet():
+    """Three simulated thermostats without latency or loss"""
+    with SimulatedFleet(3, seed=1) as fleet:
+        yield fleet
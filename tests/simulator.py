@@ -0,0 +1,287 @@
+"""Simulated Broadlink hysen (Floureon / Beok) thermostats on localhost.
+
+Each thermostat listens on its own loopback address (127.0.0.1, 127.0.0.2, ...) so hosts stay distinct,
+every address beyond 127.0.0.1 needs Linux, which routes the whole 127.0.0.0/8 to loopback.
+A single thread serves the whole fleet, responses are delayed by latency and packets dropped with loss probability.
+"""
+import heapq
+import itertools
+import random
+import select
+import socket
+import threading
+import time
+
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+DEVTYPE = 0x4EAD
+
+INIT_KEY = bytes.fromhex('097628343fe99e23765c1513accf8b02')
+INIT_VECT = bytes.fromhex('562e17996d093d28ddb3ba695a2e6f58')
+
+MAGIC = bytes.fromhex('5aa5aa555aa5aa55')
+
+PACKET_HELLO = 0x06
+PACKET_AUTH = 0x65
+PACKET_COMMAND = 0x6A
+
+# Control key expired
+ERROR_AUTH = -7
+
+SECONDS_PER_WEEK = 7 * 24 * 60 * 60
+
+
+def checksum(data) -> int:
+    return sum(data, 0xBEAF) & 0xFFFF
+
+
+def crc16(data) -> int:
+    crc = 0xFFFF
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+    return crc
+
+
+def encrypt(key, payload) -> bytes:
+    encryptor = Cipher(algorithms.AES(key), modes.CBC(INIT_VECT)).encryptor()
+    return encryptor.update(payload) + encryptor.finalize()
+
+
+def decrypt(key, payload) -> bytes:
+    decryptor = Cipher(algorithms.AES(key), modes.CBC(INIT_VECT)).decryptor()
+    return decryptor.update(payload) + decryptor.finalize()
+
+
+def local_seconds(now) -> float:
+    """Return seconds since Monday midnight of local time"""
+    local = time.localtime(now)
+    return local.tm_wday * 86400 + local.tm_hour * 3600 + local.tm_min * 60 + local.tm_sec + now % 1
+
+
+class SimulatedThermostat:
+    """Thermostat state and packet handling of a single host"""
+
+    def __init__(self, host='127.0.0.1', port=0, clock_drift=0.0, seed=None):
+        self.random = random.Random(seed)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((host, port))
+        self.sock.setblocking(False)
+        self.host, self.port = self.sock.getsockname()
+
+        self.mac = bytes(self.random.getrandbits(8) for _ in range(6))
+        self.id = self.random.getrandbits(32)
+        self.key = bytes(self.random.getrandbits(8) for _ in range(16))
+        self.expired = False
+
+        self.remote_lock = 0
+        self.power = 1
+        self.temp_manual = 0
+        self.room_temp = 20.0
+        self.thermostat_temp = 22.0
+        self.auto_mode = 0
+        # Stored as written, thermostat reports loop mode increased by one
+        self.loop_mode = 1
+        self.sensor = 0
+        self.osv = 42
+        self.dif = 2
+        self.svh = 35
+        self.svl = 5
+        self.room_temp_adj = 0.0
+        self.fre = 0
+        self.poweron = 0
+        self.external_temp = 19.5
+        self.clock_drift = clock_drift
+        self.schedule = bytearray([6, 0, 8, 0, 11, 30, 12, 30, 17, 0, 22, 0, 8, 0, 23, 0] + [44] * 8)
+
+        self.packets = 0
+        self.dropped = 0
+        self.requests = []
+
+    @property
+    def active(self) -> int:
+        temp = self.external_temp if self.sensor == 1 else self.room_temp
+        return int(bool(self.power) and temp < self.thermostat_temp)
+
+    def registers(self) -> bytes:
+        """Return full status registers"""
+        seconds = int(local_seconds(time.time()) + self.clock_drift) % SECONDS_PER_WEEK
+        return bytes([
+            self.remote_lock,
+            self.power | self.active << 4 | self.temp_manual << 6,
+            int(self.room_temp * 2),
+            int(self.thermostat_temp * 2),
+            self.loop_mode << 4 | self.auto_mode,
+            self.sensor,
+            self.osv,
+            self.dif,
+            self.svh,
+            self.svl,
+            *int(self.room_temp_adj * 10).to_bytes(2, 'big', signed=True),
+            self.fre,
+            self.poweron,
+            0,
+            int(self.external_temp * 2),
+            seconds // 3600 % 24,
+            seconds // 60 % 60,
+            seconds % 60,
+            seconds // 86400 + 1,
+            *self.schedule
+        ])
+
+    def write(self, register, data) -> None:
+        """Write 16 bit registers starting at register"""
+        if register == 0:
+            self.remote_lock, self.power = data[0], data[1] & 1
+        elif register == 1:
+            # High byte is read only room temperature
+            self.thermostat_temp = data[1] / 2.0
+            if self.auto_mode:
+                self.temp_manual = 1
+        elif register == 2:
+            self.auto_mode, self.loop_mode, self.sensor = data[0] & 0xF, data[0] >> 4, data[1]
+            self.temp_manual = 0
+        elif register == 8:
+            hour, minute, second, day = data[:4]
+            seconds = (day - 1) * 86400 + hour * 3600 + minute * 60 + second
+            self.clock_drift = seconds - local_seconds(time.time())
+        elif register == 0x0A:
+            self.schedule[:] = data[:len(self.schedule)]
+
+    def request(self, request) -> bytes:
+        """Handle hysen request, return response"""
+        self.requests.append(bytes(request))
+        function, register = request[1], request[3]
+        if function == 0x03:
+            count = request[5] * 2
+            return bytes([0x01, 0x03, count]) + self.registers()[:count]
+
+        if function == 0x06:
+            self.write(register, request[4:6])
+        elif function == 0x10:
+            self.write(register, request[7:7 + request[6]])
+
+        return bytes(request[:6])
+
+    def handle(self, packet):
+        """Handle packet, return response or None when it is ignored"""
+        if packet[:8] != MAGIC:
+            if packet[0x26] != PACKET_HELLO:
+                return None
+            response = bytearray(0x80)
+            response[0x34:0x36] = DEVTYPE.to_bytes(2, 'little')
+            response[0x3A:0x40] = self.mac[::-1]
+            response[0x40:0x49] = b'Simulated'
+            return bytes(response)
+
+        packet_type = int.from_bytes(packet[0x26:0x28], 'little')
+        error = 0
+        if packet_type == PACKET_AUTH:
+            self.expired = False
+            payload = encrypt(INIT_KEY, self.id.to_bytes(4, 'little') + self.key + bytes(12))
+        elif self.expired:
+            error, payload = ERROR_AUTH, b''
+        else:
+            request = decrypt(self.key, packet[0x38:])
+            length = int.from_bytes(request[:2], 'little')
+            response = self.request(request[2:length])
+            payload = (len(response) + 2).to_bytes(2, 'little') + response + crc16(response).to_bytes(2, 'little')
+            payload = encrypt(self.key, payload + bytes((16 - len(payload)) % 16))
+
+        response = bytearray(0x38)
+        response[0x00:0x08] = MAGIC
+        response[0x22:0x24] = error.to_bytes(2, 'little', signed=True)
+        response[0x24:0x26] = DEVTYPE.to_bytes(2, 'little')
+        response[0x26:0x28] = packet[0x26:0x28]
+        response[0x28:0x2A] = packet[0x28:0x2A]
+        response[0x2A:0x30] = self.mac[::-1]
+        response[0x30:0x34] = self.id.to_bytes(4, 'little')
+        response.extend(payload)
+        response[0x20:0x22] = checksum(response).to_bytes(2, 'little')
+
+        return bytes(response)
+
+    def expire(self) -> None:
+        """Reject commands until thermostat is authenticated again"""
+        self.expired = True
+
+
+class SimulatedFleet:
+    """Thermostats served by a single thread, use as context manager"""
+
+    def __init__(self, size=1, latency=0.0, loss=0.0, seed=None):
+        self.latency = latency
+        self.loss = loss
+        self.random = random.Random(seed)
+        self.thermostats = [
+            SimulatedThermostat('127.0.{0}.{1}'.format((i + 1) // 256, (i + 1) % 256), seed=self.random.random())
+            for i in range(size)
+        ]
+        self._sockets = {thermostat.sock: thermostat for thermostat in self.thermostats}
+        self._pending = []
+        self._sequence = itertools.count()
+        self._wakeup, self._waker = socket.socketpair()
+        self._running = False
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def __iter__(self):
+        return iter(self.thermostats)
+
+    def __len__(self) -> int:
+        return len(self.thermostats)
+
+    def __getitem__(self, index) -> SimulatedThermostat:
+        return self.thermostats[index]
+
+    def start(self) -> None:
+        self._running = True
+        self._thread = threading.Thread(target=self._serve, name='floureon simulator', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._running = False
+        self._waker.send(b'\0')
+        self._thread.join()
+        for sock in [*self._sockets, self._wakeup, self._waker]:
+            sock.close()
+
+    def _serve(self) -> None:
+        while self._running:
+            timeout = max(self._pending[0][0] - time.monotonic(), 0) if self._pending else None
+            readable, _, _ = select.select([*self._sockets, self._wakeup], [], [], timeout)
+
+            for sock in readable:
+                if sock is self._wakeup:
+                    sock.recv(1)
+                    continue
+                self._receive(self._sockets[sock])
+
+            now = time.monotonic()
+            while self._pending and self._pending[0][0] <= now:
+                _, _, sock, response, addr = heapq.heappop(self._pending)
+                sock.sendto(response, addr)
+
+    def _receive(self, thermostat) -> None:
+        try:
+            packet, addr = thermostat.sock.recvfrom(2048)
+        except BlockingIOError:
+            return
+
+        thermostat.packets += 1
+        if self.random.random() < self.loss:
+            thermostat.dropped += 1
+            return
+
+        response = thermostat.handle(packet)
+        if response is not None:
+            heapq.heappush(
+                self._pending, (time.monotonic() + self.latency, next(self._sequence), thermostat.sock, response, addr)
+            )
@@ -0,0 +1,63 @@
+"""Tests of thermostat circuit breaker"""
+import time
+
+from custom_components.floureon import (
+    BREAKER_DEGRADED,
+    BREAKER_HEALTHY,
+    BREAKER_MAX_BACKOFF,
+    BREAKER_MIN_BACKOFF,
+    BREAKER_OPEN,
+    BREAKER_THRESHOLD,
+    CircuitBreaker
+)
+
+
+def test_opens_after_threshold() -> None:
+    breaker = CircuitBreaker('127.0.0.1')
+    for _ in range(BREAKER_THRESHOLD - 1):
+        breaker.failure()
+        assert breaker.state == BREAKER_DEGRADED
+        assert breaker.allow()
+
+    breaker.failure()
+    assert breaker.state == BREAKER_OPEN
+    assert breaker.backoff == BREAKER_MIN_BACKOFF
+    assert not breaker.allow()
+
+
+def test_single_probe_after_backoff() -> None:
+    breaker = CircuitBreaker('127.0.0.1')
+    for _ in range(BREAKER_THRESHOLD):
+        breaker.failure()
+
+    breaker.probe_time = time.monotonic() - 1
+    assert breaker.allow()
+    # Other calls are rejected while probe is running
+    assert not breaker.allow()
+
+    breaker.success()
+    assert breaker.state == BREAKER_HEALTHY
+    assert breaker.failures == 0
+    assert breaker.allow()
+
+
+def test_backoff_doubles_up_to_maximum() -> None:
+    breaker = CircuitBreaker('127.0.0.1')
+    backoffs = []
+    for _ in range(BREAKER_THRESHOLD + 10):
+        breaker.failure()
+        backoffs.append(breaker.backoff)
+
+    assert backoffs[BREAKER_THRESHOLD - 1:BREAKER_THRESHOLD + 2] == [
+        BREAKER_MIN_BACKOFF, BREAKER_MIN_BACKOFF * 2, BREAKER_MIN_BACKOFF * 4
+    ]
+    assert backoffs[-1] == BREAKER_MAX_BACKOFF
+
+
+def test_long_outage_does_not_overflow() -> None:
+    breaker = CircuitBreaker('127.0.0.1')
+    for _ in range(10000):
+        breaker.failure()
+
+    assert breaker.backoff == BREAKER_MAX_BACKOFF
+    assert breaker.probe_time <= time.monotonic() + BREAKER_MAX_BACKOFF.total_seconds()
@@ -0,0 +1,300 @@
+"""Tests of coordinator command queue and services, thermostat calls are answered by a fake"""
+import asyncio
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+import custom_components.floureon as floureon
+from custom_components.floureon import (
+    ATTR_WEEKEND,
+    DATA_ENTITIES,
+    DATA_POLLER,
+    DOMAIN,
+    BroadlinkThermostat,
+    FleetPoller,
+    FloureonCoordinator,
+    protocol
+)
+
+# Read with full status only
+FULL_STATUS_FIELDS = ('hour', 'min', 'sec', 'dayofweek', 'weekday', 'weekend')
+
+WEEKEND = [{'start_hour': 8, 'start_minute': 0, 'temp': 21.0}, {'start_hour': 23, 'start_minute': 0, 'temp': 17.0}]
+
+
+class FakeThermostat:
+    """Answers coordinator calls from status dict, commands update it unless rejected"""
+
+    def __init__(self, status):
+        self.status = dict(status)
+        self.calls = []
+        self.error = None
+        self.rejected = set()
+
+    async def async_call(self, *commands) -> list:
+        await asyncio.sleep(0.01)
+        self.calls.append(commands)
+        if self.error is not None:
+            raise self.error
+
+        results = []
+        for command, *args in commands:
+            if command == 'get_full_status':
+                results.append(dict(self.status))
+                continue
+            if command == 'get_status':
+                results.append({key: value for key, value in self.status.items() if key not in FULL_STATUS_FIELDS})
+                continue
+            if command not in self.rejected:
+                self.status.update(FloureonCoordinator.commands_status([(command, *args)]))
+            results.append(None)
+
+        return results
+
+    @property
+    def writes(self) -> list:
+        return [commands for commands in self.calls if commands[0][0] not in ('get_status', 'get_full_status')]
+
+
+class FakeEntity:
+    """Service target of a coordinator"""
+
+    def __init__(self, entity_id, coordinator):
+        self.entity_id = entity_id
+        self.coordinator = coordinator
+
+    async def async_bulk_apply(self, **params) -> bool:
+        return await self.coordinator.async_execute(('set_temp', params['temperature']))
+
+
+@pytest.fixture
+def status(fleet) -> dict:
+    """Full status of simulated thermostat in manual mode"""
+    return protocol.decode_status(bytes([0x01, 0x03, 44]) + fleet[0].registers())
+
+
+@pytest.fixture
+def coordinators(hass, monkeypatch):
+    """Return factory of coordinators answered by fake thermostats"""
+    monkeypatch.setattr(floureon, 'DEFAULT_COMMAND_DELAY', 0.01)
+    created = []
+
+    def create(status, data=True):
+        coordinator = FloureonCoordinator(hass, '127.0.0.{0}'.format(len(created) + 1))
+        coordinator.fake = FakeThermostat(status)
+        coordinator.async_call = coordinator.fake.async_call
+        if data:
+            coordinator.data = floureon.ThermostatStatus(**status)
+        created.append(coordinator)
+        return coordinator
+
+    yield create
+
+    for coordinator in created:
+        coordinator.async_unload()
+    # Broadlink sessions are shared by host across tests
+    BroadlinkThermostat._sessions.clear()
+
+
+async def async_call_service(hass, monkeypatch, service, coordinators, **data) -> dict:
+    """Call service on entities of coordinators, failing instead of hanging"""
+    entities = [FakeEntity('climate.test_{0}'.format(i), coordinator) for i, coordinator in enumerate(coordinators)]
+    hass.data.setdefault(DOMAIN, {})[DATA_ENTITIES] = {entity.entity_id: entity for entity in entities}
+
+    async def async_extract_entity_ids(hass, call):
+        return [entity.entity_id for entity in entities]
+
+    monkeypatch.setattr(floureon, 'async_extract_entity_ids', async_extract_entity_ids)
+    return await asyncio.wait_for(service(hass, SimpleNamespace(data=data)), 5)
+
+
+async def test_set_schedule_of_more_unread_hosts_than_poll_slots(hass, monkeypatch, status, coordinators) -> None:
+    """Reading unknown schedule does not wait for a slot held by the same call"""
+    hass.data.setdefault(DOMAIN, {})[DATA_POLLER] = FleetPoller(2)
+    targets = [coordinators(status, data=False) for _ in range(5)]
+
+    response = await async_call_service(
+        hass, monkeypatch, floureon.async_set_schedule_service, targets, **{ATTR_WEEKEND: WEEKEND}
+    )
+
+    assert all(result['success'] for result in response['results'].values())
+    for coordinator in targets:
+        calls = [commands[0][0] for commands in coordinator.fake.calls]
+        assert calls == ['get_full_status', 'set_schedule', 'get_status']
+        assert coordinator.data.weekend == ((8, 0, 21.0), (23, 0, 17.0))
+
+
+async def test_bulk_apply_holds_slots_for_writes_only(hass, monkeypatch, status, coordinators) -> None:
+    """Commands of every host wait out command delay together, not one batch of slots after another"""
+    hass.data.setdefault(DOMAIN, {})[DATA_POLLER] = FleetPoller(2)
+    targets = [coordinators(status) for _ in range(8)]
+    monkeypatch.setattr(floureon, 'DEFAULT_COMMAND_DELAY', 0.2)
+
+    start = time.monotonic()
+    response = await async_call_service(hass, monkeypatch, floureon.async_bulk_apply_service, targets, temperature=25)
+
+    # Four batches of slots each waiting out the delay would take 0.8 seconds
+    assert time.monotonic() - start < 0.6
+    assert all(result['success'] for result in response['results'].values())
+
+
+async def test_stats_report_session_cache_hits(hass, status, coordinators) -> None:
+    coordinator = coordinators(status)
+    coordinator.client.cache_hits = 3
+    coordinator.thermostat.session.cache_hits = 2
+
+    assert coordinator.stats['cache_hits'] == 5
+
+
+async def test_malformed_packet_falls_back_for_single_call(hass, monkeypatch, status, coordinators) -> None:
+    coordinator = coordinators(status)
+    errors = [protocol.ThermostatDataError('Response CRC error')]
+
+    async def execute(*commands):
+        if errors:
+            raise errors.pop()
+        return ['asyncio']
+
+    monkeypatch.setattr(coordinator.client, 'execute', execute)
+    monkeypatch.setattr(coordinator.thermostat, 'run', lambda *commands: ['broadlink'])
+
+    assert await coordinator._async_call(('get_status',)) == ['broadlink']
+    assert await coordinator._async_call(('get_status',)) == ['asyncio']
+    assert coordinator.client is not None
+    assert coordinator.stats['client_fallbacks'] == 1
+    assert coordinator.executor_jobs == 1
+
+
+async def test_commands_within_delay_are_coalesced(hass, status, coordinators) -> None:
+    coordinator = coordinators(status)
+
+    results = await asyncio.gather(
+        coordinator.async_execute(('set_temp', 23)),
+        coordinator.async_execute(('set_power', 1), ('set_temp', 24.5))
+    )
+
+    assert results == [True, True]
+    # Power is on already, last temperature wins
+    assert coordinator.fake.writes == [(('set_temp', 24.5),)]
+    assert coordinator.commands_coalesced == 1
+    assert coordinator.commands_skipped == 1
+    assert coordinator.data.thermostat_temp == 24.5
+
+
+async def test_applied_temperature_is_skipped_in_manual_mode_only(hass, status, coordinators) -> None:
+    coordinator = coordinators({**status, 'thermostat_temp': 22.0})
+
+    # Thermostat stores half degrees
+    assert await coordinator.async_execute(('set_temp', 22.2))
+    assert coordinator.fake.writes == []
+    assert coordinator.commands_skipped == 1
+
+    # Switching to manual mode overrides schedule temperature, so temperature is written along
+    coordinator.data = coordinator.data.replace(auto_mode=1, temp_manual=0)
+    assert await coordinator.async_execute(('set_mode', 0, 0, 0), ('set_temp', 22))
+    assert coordinator.fake.writes == [(('set_mode', 0, 0, 0), ('set_temp', 22))]
+
+
+async def test_failed_write_rolls_back_optimistic_status(hass, status, coordinators) -> None:
+    coordinator = coordinators({**status, 'thermostat_temp': 22.0})
+    coordinator.fake.error = ConnectionError('Network is unreachable')
+
+    task = asyncio.ensure_future(coordinator.async_execute(('set_temp', 25)))
+    await asyncio.sleep(0)
+    # Entities show commanded temperature while write is pending
+    assert coordinator.status.thermostat_temp == 25.0
+
+    assert not await task
+    assert coordinator.optimistic == {}
+    assert coordinator.status.thermostat_temp == 22.0
+
+
+async def test_rejected_write_rolls_back_to_read_status(hass, status, coordinators) -> None:
+    coordinator = coordinators({**status, 'thermostat_temp': 22.0})
+    coordinator.fake.rejected.add('set_temp')
+
+    assert await coordinator.async_execute(('set_temp', 25))
+    assert coordinator.commands_rejected == 1
+    assert coordinator.optimistic == {}
+    assert coordinator.status.thermostat_temp == 22.0
+
+
+async def test_bulk_apply_merges_writes_of_host(hass, monkeypatch, status, coordinators) -> None:
+    shared, single, unreachable = coordinators(status), coordinators(status), coordinators(status)
+    unreachable.fake.error = ConnectionError('Network is unreachable')
+
+    response = await async_call_service(
+        hass, monkeypatch, floureon.async_bulk_apply_service, [shared, shared, single, unreachable], temperature=25
+    )
+
+    assert response['results'] == {
+        'climate.test_0': {'host': shared.host, 'success': True},
+        'climate.test_1': {'host': shared.host, 'success': True},
+        'climate.test_2': {'host': single.host, 'success': True},
+        'climate.test_3': {'host': unreachable.host, 'success': False}
+    }
+    assert shared.fake.writes == [(('set_temp', 25),)]
+    assert single.fake.writes == [(('set_temp', 25),)]
+
+
+async def test_set_schedule_matching_cache_is_not_written(hass, status, coordinators) -> None:
+    coordinator = coordinators(status)
+    weekend = floureon.ThermostatStatus.schedule_periods(coordinator.data.weekend)
+
+    assert await coordinator.async_set_schedule(weekend=weekend)
+    assert coordinator.fake.calls == []
+    assert coordinator.commands_skipped == 1
+
+    assert await coordinator.async_set_schedule(weekend=WEEKEND)
+    weekday = floureon.ThermostatStatus.schedule_periods(coordinator.data.weekday)
+    assert coordinator.fake.writes == [(('set_schedule', weekday, WEEKEND),)]
+
+
+def fixed_now(now):
+    """Return datetime class whose now() is fixed"""
+    class FixedDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return now
+
+    return FixedDatetime
+
+
+def with_clock(coordinator, dayofweek, hour, minute, second) -> None:
+    """Set thermostat clock of freshly read full status"""
+    coordinator.data = coordinator.data.replace(dayofweek=dayofweek, hour=hour, min=minute, sec=second)
+    coordinator._full_status_time = time.monotonic()
+
+
+async def test_clock_drift_wraps_around_week(hass, monkeypatch, status, coordinators) -> None:
+    coordinator = coordinators(status)
+    # Monday 00:00:30 local time
+    monkeypatch.setattr(floureon, 'datetime', fixed_now(datetime(2026, 10, 12, 0, 0, 30)))
+
+    with_clock(coordinator, 7, 23, 59, 50)
+    assert coordinator.read_clock_drift() == pytest.approx(-40, abs=0.5)
+
+    with_clock(coordinator, 1, 0, 1, 0)
+    assert coordinator.read_clock_drift() == pytest.approx(30, abs=0.5)
+
+
+async def test_clock_sync_threshold_and_window(hass, monkeypatch, status, coordinators) -> None:
+    coordinator = coordinators(status)
+    monkeypatch.setattr(floureon, 'datetime', fixed_now(datetime(2026, 10, 14, 12, 0, 0)))
+    threshold, window = 60, timedelta(hours=6)
+
+    with_clock(coordinator, 3, 12, 0, 30)
+    assert not await coordinator.async_sync_clock(threshold, window)
+    assert coordinator.clock_drift == pytest.approx(30, abs=0.5)
+
+    with_clock(coordinator, 3, 12, 2, 0)
+    assert await coordinator.async_sync_clock(threshold, window)
+    assert coordinator.fake.writes == [(('set_time', 12, 0, 0, 3),)]
+
+    # Still drifting on next full status, but time was set within window
+    with_clock(coordinator, 3, 12, 2, 0)
+    assert not await coordinator.async_sync_clock(threshold, window)
+    assert coordinator.clock_syncs == 1
+    assert len(coordinator.fake.writes) == 1
@@ -0,0 +1,109 @@
+"""Tests of status history ring buffer"""
+import pytest
+
+from custom_components.floureon.history import HEADER, RECORD, StatusHistory
+
+
+def slope(points) -> float:
+    """Least squares slope per hour"""
+    n = len(points)
+    mean_t = sum(t for t, _ in points) / n
+    mean_y = sum(y for _, y in points) / n
+    return sum((t - mean_t) * (y - mean_y) for t, y in points) / sum((t - mean_t) ** 2 for t, _ in points) * 3600
+
+
+def test_ring_buffer_keeps_newest_records() -> None:
+    history = StatusHistory(4, 3600)
+    for i in range(6):
+        history.append(1000 + i * 60, 20 + i / 2, 19, 22, i % 2)
+
+    assert history.count == 4
+    assert [record[0] for record in history.records()] == [1120, 1180, 1240, 1300]
+    # Temperatures are stored in half degrees
+    assert history.records()[-1] == (1300, 45, 38, 44, 1)
+
+
+def test_duty_cycle() -> None:
+    history = StatusHistory(100, 3600)
+    assert history.duty_cycle is None
+
+    # Heating for 60 of 240 seconds
+    for timestamp, active in [(0, 1), (60, 0), (120, 0), (180, 0), (240, 0)]:
+        history.append(timestamp, 20, 20, 22, active)
+
+    assert history.duty_cycle == 25.0
+
+
+def test_temperature_rates() -> None:
+    history = StatusHistory(100, 3600)
+    points = [(i * 300, 18 + i * 0.5) for i in range(10)]
+    for timestamp, temp in points:
+        history.append(timestamp, temp, 25 - temp, 22, 1)
+
+    assert history.room_temp_rate == pytest.approx(slope(points), abs=0.01)
+    assert history.external_temp_rate == pytest.approx(-slope(points), abs=0.01)
+
+
+def test_window_drops_old_records() -> None:
+    """Sums cover window only, same as computing them from records within window"""
+    history = StatusHistory(1000, 600)
+    records = [(i * 60, 18 + (i % 7) / 2, 10 + (i % 3) / 2, 22, i % 3 == 0) for i in range(50)]
+    for record in records:
+        history.append(*record)
+
+    window = [record for record in records if records[-1][0] - record[0] <= 600]
+    expected = StatusHistory(1000, 600)
+    for record in window:
+        expected.append(*record)
+
+    assert history.duty_cycle == expected.duty_cycle
+    assert history.room_temp_rate == pytest.approx(expected.room_temp_rate, abs=0.01)
+    assert history.count == len(records)
+
+
+def test_full_buffer_evicts_from_window() -> None:
+    history = StatusHistory(5, 3600)
+    for i in range(20):
+        history.append(i * 60, 20 + i / 2, 20, 22, i % 2)
+
+    expected = StatusHistory(5, 3600)
+    for i in range(15, 20):
+        expected.append(i * 60, 20 + i / 2, 20, 22, i % 2)
+
+    assert history.duty_cycle == expected.duty_cycle
+    assert history.room_temp_rate == expected.room_temp_rate
+
+
+def test_file_restores_records(tmp_path) -> None:
+    path = tmp_path / 'history.bin'
+    history = StatusHistory(10, 3600)
+    history.open(path, 0)
+    for i in range(12):
+        history.append(i * 60, 20 + i / 2, 19, 22, i % 2)
+    history.close()
+    records, duty_cycle, room_temp_rate = history.records(), history.duty_cycle, history.room_temp_rate
+
+    assert path.stat().st_size == HEADER.size + 10 * RECORD.size
+    # History stays usable in memory after file is closed
+    history.append(12 * 60, 26, 19, 22, 0)
+
+    restored = StatusHistory(10, 3600)
+    restored.open(path, 11 * 60)
+    assert restored.records() == records
+    assert restored.duty_cycle == duty_cycle
+    assert restored.room_temp_rate == pytest.approx(room_temp_rate, abs=0.01)
+    restored.close()
+
+
+def test_file_of_other_capacity_is_reset(tmp_path) -> None:
+    path = tmp_path / 'history.bin'
+    history = StatusHistory(10, 3600)
+    history.open(path, 0)
+    history.append(0, 20, 19, 22, 1)
+    history.close()
+
+    resized = StatusHistory(20, 3600)
+    resized.open(path, 0)
+    assert resized.count == 0
+    assert resized.records() == []
+    resized.close()
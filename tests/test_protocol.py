@@ -0,0 +1,183 @@
+"""Tests of native asyncio thermostat client"""
+import asyncio
+
+import broadlink
+import pytest
+
+from custom_components.floureon import protocol
+from tests.simulator import DEVTYPE, SimulatedFleet
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(protocol, 'RETRY_INTERVAL', 0.05)
+
+
+def test_checksum() -> None:
+    assert protocol.checksum(b'') == 0xBEAF
+    assert protocol.checksum(bytes([0xFF] * 0x200)) == (0xBEAF + 0xFF * 0x200) & 0xFFFF
+
+
+def test_crc16() -> None:
+    # Modbus CRC-16 check value
+    assert protocol.crc16(b'123456789') == 0x4B37
+    assert protocol.crc16(b'') == 0xFFFF
+
+
+def test_decode_status(fleet) -> None:
+    thermostat = fleet[0]
+    thermostat.thermostat_temp = 21.5
+    thermostat.room_temp_adj = -1.5
+    registers = thermostat.registers()
+
+    status = protocol.decode_status(bytes([0x01, 0x03, 16]) + registers[:16])
+    assert status['power'] == 1
+    assert status['active'] == 1
+    assert status['thermostat_temp'] == 21.5
+    assert status['room_temp'] == 20.0
+    assert status['external_temp'] == 19.5
+    assert status['loop_mode'] == 1
+    assert status['room_temp_adj'] == -1.5
+    assert 'hour' not in status and 'weekday' not in status
+
+    status = protocol.decode_status(bytes([0x01, 0x03, 44]) + registers)
+    assert status['dayofweek'] == registers[19]
+    assert status['weekday'][2] == {'start_hour': 11, 'start_minute': 30, 'temp': 22.0}
+    assert len(status['weekday']) == 6 and len(status['weekend']) == 2
+
+
+def test_decode_matches_broadlink(fleet) -> None:
+    """Native decoder reads the same status as broadlink library"""
+    thermostat = fleet[0]
+    device = broadlink.gendevice(DEVTYPE, (thermostat.host, thermostat.port), thermostat.mac)
+    assert device.auth()
+
+    payload = device.send_request(protocol.REQUEST_FULL_STATUS)
+    device.send_request = lambda request: payload
+    status = protocol.decode_status(payload)
+    # Newer broadlink versions report extra keys
+    assert status == {key: value for key, value in device.get_full_status().items() if key in status}
+
+
+async def test_commands(fleet) -> None:
+    thermostat = fleet[0]
+    client = protocol.AsyncThermostat(thermostat.host, port=thermostat.port)
+    try:
+        await client.execute(
+            ('set_power', 0),
+            ('set_mode', 1, 0, 1),
+            ('set_temp', 23.5),
+            ('set_time', 12, 30, 0, 3),
+            ('set_schedule', [{'start_hour': h, 'start_minute': 0, 'temp': 20.5} for h in range(6)],
+             [{'start_hour': h, 'start_minute': 15, 'temp': 18} for h in range(2)])
+        )
+        status, = await client.execute(('get_full_status',))
+    finally:
+        client.close()
+
+    assert client.mac == thermostat.mac
+    assert status['power'] == 0
+    assert status['auto_mode'] == 1
+    assert status['loop_mode'] == 1
+    assert status['sensor'] == 1
+    assert status['thermostat_temp'] == 23.5
+    assert status['temp_manual'] == 1
+    assert (status['dayofweek'], status['hour'], status['min']) == (3, 12, 30)
+    assert status['weekday'][5] == {'start_hour': 5, 'start_minute': 0, 'temp': 20.5}
+    assert status['weekend'][1] == {'start_hour': 1, 'start_minute': 15, 'temp': 18.0}
+
+
+async def test_stored_session_key(fleet) -> None:
+    """Known identity skips discovery and authentication"""
+    thermostat = fleet[0]
+    client = protocol.AsyncThermostat(
+        thermostat.host, mac=thermostat.mac, devtype=DEVTYPE, key=thermostat.key, device_id=thermostat.id,
+        port=thermostat.port
+    )
+    try:
+        status, = await client.execute(('get_status',))
+    finally:
+        client.close()
+
+    assert status['thermostat_temp'] == thermostat.thermostat_temp
+    assert client.reauths == 0
+    assert client.cache_hits == 1
+    assert thermostat.requests == [bytes(protocol.REQUEST_STATUS)]
+
+
+async def test_reauthenticate_expired_session(fleet) -> None:
+    thermostat = fleet[0]
+    client = protocol.AsyncThermostat(thermostat.host, port=thermostat.port)
+    try:
+        await client.execute(('get_status',))
+        thermostat.expire()
+        status, = await client.execute(('get_status',))
+    finally:
+        client.close()
+
+    assert status['power'] == 1
+    assert client.reauths == 2
+    # Expired session is found on the cached attempt of second call
+    assert client.cache_hits == 1
+
+
+async def test_retransmit_lost_packets() -> None:
+    with SimulatedFleet(1, loss=0.5, seed=3) as fleet:
+        client = protocol.AsyncThermostat(fleet[0].host, port=fleet[0].port)
+        try:
+            for _ in range(5):
+                await client.execute(('get_status',))
+        finally:
+            client.close()
+
+    assert fleet[0].dropped > 0
+    assert client.retries >= fleet[0].dropped
+
+
+async def test_timeout() -> None:
+    with SimulatedFleet(1, loss=1.0) as fleet:
+        client = protocol.AsyncThermostat(fleet[0].host, port=fleet[0].port, timeout=0.2)
+        try:
+            with pytest.raises(asyncio.TimeoutError):
+                await client.execute(('get_status',))
+        finally:
+            client.close()
+
+
+async def test_fleet_transport(fleet) -> None:
+    """Responses on shared socket reach thermostat they came from"""
+    transport = protocol.FleetTransport()
+    clients = []
+    for i, thermostat in enumerate(fleet):
+        thermostat.thermostat_temp = 20 + i
+        clients.append(protocol.AsyncThermostat(thermostat.host, port=thermostat.port, fleet=transport))
+
+    try:
+        results = await asyncio.gather(*(client.execute(('get_status',)) for client in clients))
+        assert [status['thermostat_temp'] for status, in results] == [20.0, 21.0, 22.0]
+        assert len({client._protocol.addr for client in clients}) == len(fleet)
+    finally:
+        for client in clients:
+            client.close()
+        transport.close()
+
+
+async def test_fleet_transport_shared_thermostat(fleet) -> None:
+    """Clients of the same thermostat, ex. YAML and config entry, both receive their responses"""
+    transport = protocol.FleetTransport()
+    clients = [protocol.AsyncThermostat(fleet[0].host, port=fleet[0].port, fleet=transport) for _ in range(2)]
+
+    try:
+        for _ in range(3):
+            results = await asyncio.gather(*(client.execute(('get_status',)) for client in clients))
+            assert [status['thermostat_temp'] for status, in results] == [fleet[0].thermostat_temp] * 2
+
+        clients[0].close()
+        status, = await clients[1].execute(('get_status',))
+        assert status['power'] == 1
+    finally:
+        for client in clients:
+            client.close()
+        transport.close()
+
+    assert sum(client.retries for client in clients) == 0
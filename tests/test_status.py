@@ -0,0 +1,25 @@
+"""Tests of shared thermostat status record"""
+from custom_components.floureon import FloureonCoordinator, ThermostatStatus
+
+SCHEDULE = [{'start_hour': hour, 'start_minute': 0, 'temp': 21.3} for hour in range(6)]
+
+
+def test_unknown_fields_are_ignored() -> None:
+    """Newer broadlink versions report keys outside status layout"""
+    status = ThermostatStatus(power=1, thermostat_temp=21.5, heating_cooling=0)
+
+    assert status.power == 1
+    assert 'heating_cooling' not in status.as_dict()
+    assert status.replace(heating_cooling=1).thermostat_temp == 21.5
+
+
+def test_schedule_in_half_degrees() -> None:
+    status = ThermostatStatus(weekday=SCHEDULE, weekend=SCHEDULE[:2])
+
+    assert status.weekday[0] == (0, 0, 21.0)
+    assert ThermostatStatus.schedule_periods(status.weekend)[1] == {'start_hour': 1, 'start_minute': 0, 'temp': 21.0}
+
+
+def test_commands_status_in_half_degrees() -> None:
+    assert FloureonCoordinator.commands_status([('set_temp', 21.3)]) == {'thermostat_temp': 21.0}
+    assert FloureonCoordinator.commands_status([('set_mode', 1, 0, 1)]) == {'auto_mode': 1, 'loop_mode': 1, 'sensor': 1}